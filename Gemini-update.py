@@ -1,17 +1,224 @@
-import os, io, pathlib, shutil, pickle
+import os, io, re, time, json, hashlib, pathlib, shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import streamlit as st
-from pypdf import PdfReader
 import duckdb
+import pyarrow as pa
+import google.generativeai as genai
+
+try:
+    import fitz  # PyMuPDF: native text extraction, much faster than pypdf
+except ImportError:
+    fitz = None
+    from pypdf import PdfReader
 
 # --- local modules (ensure app/__init__.py exists) ---
-from app.utils import excel_to_duckdb, excel_to_text
+from app.utils import excel_to_duckdb, excel_to_text, sanitize_table_name
 from app.ocr import ocr_pdf
-from app.retriever import build_dense_index, hybrid_search
+from app.retriever import _emb, hybrid_search
 from app.gemini_client import gemini_chat  # you already have a Gemini-only client
 
 # ------- Constants -------
 INDEX_DIR = "indexes"
 UPLOAD_DIR = "uploads"
+IVFPQ_MIN_CHUNKS = 5000  # below this an fp16 flat index is small enough
+MODEL_NAME = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+ANSWER_CACHE_TTL = 3600
+ANSWER_CACHE_MAX = 256
+MANIFEST_PATH = os.path.join(UPLOAD_DIR, ".manifest.json")  # {filename: blake2b hex}
+CHUNK_CACHE_PATH = os.path.join(INDEX_DIR, "chunks.parquet")
+
+_WORD_RE = re.compile(r"\S+")
+
+def window_chunks(text: str, size: int, overlap: int):
+    """Split text into overlapping windows of `size` words.
+
+    Word boundaries are located once and each chunk is a single slice of the
+    original string, instead of re-joining a list of words per window.
+    """
+    spans = [m.span() for m in _WORD_RE.finditer(text)]
+    step = size - overlap
+    return [
+        text[spans[i][0]:spans[min(i + size, len(spans)) - 1][1]]
+        for i in range(0, len(spans), step)
+    ]
+
+def sheet_list_path(excel_path: str) -> str:
+    """Where excel_to_parquet records a workbook's {sheet: parquet filename}."""
+    return os.path.join(UPLOAD_DIR, f"{pathlib.Path(excel_path).name}.sheets.json")
+
+def excel_to_parquet(path: str):
+    """Write each sheet of an Excel file to uploads/<stem>__<sheet>.parquet.
+
+    The sheets written are recorded next to the workbook (see sheet_list_path),
+    so SQL mode never has to guess ownership from filename prefixes.
+    """
+    import pandas as pd
+    p = pathlib.Path(path)
+    xls = pd.ExcelFile(path, engine="openpyxl")
+    written = {}
+    for sheet in xls.sheet_names:
+        fname = f"{p.stem}__{sheet}.parquet"
+        out = os.path.join(UPLOAD_DIR, fname)
+        try:
+            xls.parse(sheet).to_parquet(out, index=False)
+            written[sheet] = fname
+        except Exception:
+            # e.g. mixed-type object columns; SQL mode falls back to the Excel loader
+            if os.path.exists(out):
+                os.remove(out)
+    with open(sheet_list_path(path), "w", encoding="utf-8") as f:
+        json.dump(written, f)
+
+def register_excel_tables(con, excel_paths):
+    """Expose Excel sheets to DuckDB, preferring the Parquet copies written at ingest.
+
+    Files without an up-to-date Parquet copy go through excel_to_duckdb as before.
+    """
+    mapping, fallback = {}, []
+    for xp in excel_paths:
+        p = pathlib.Path(xp)
+        try:
+            with open(sheet_list_path(xp), "r", encoding="utf-8") as f:
+                sheets = json.load(f)
+        except (OSError, ValueError):
+            sheets = {}
+        parquets = {
+            sheet: os.path.join(UPLOAD_DIR, fname) for sheet, fname in sheets.items()
+            if os.path.exists(os.path.join(UPLOAD_DIR, fname))
+            and os.path.getmtime(os.path.join(UPLOAD_DIR, fname)) >= os.path.getmtime(xp)
+        }
+        if not parquets or len(parquets) < len(sheets):
+            fallback.append(xp)
+            continue
+        for sheet, pq_file in parquets.items():
+            tname = sanitize_table_name(f"{p.stem}__{sheet}")
+            pq_path = pq_file.replace("'", "''")
+            con.execute(f"CREATE OR REPLACE VIEW {tname} AS SELECT * FROM read_parquet('{pq_path}')")
+            mapping[tname] = f"{p.name} :: {sheet}"
+    if fallback:
+        mapping.update(excel_to_duckdb(con, fallback))
+    return mapping
+
+def df_to_md(df, n: int = 10) -> str:
+    """Render the first `n` rows as a markdown table (no tabulate dependency)."""
+    def cell(v):
+        return str(v).replace("|", "\\|").replace("\n", " ")
+    header = "| " + " | ".join(cell(c) for c in df.columns) + " |"
+    sep = "|" + "---|" * len(df.columns)
+    rows = ["| " + " | ".join(cell(v) for v in row) + " |" for row in df.head(n).itertuples(index=False)]
+    return "\n".join([header, sep, *rows])
+
+def duck_connection(excel_paths):
+    """Session-cached DuckDB connection with the Excel tables registered.
+
+    Rebuilt only when an Excel file or its Parquet copy changes.
+    """
+    key = tuple(sorted(
+        (f, os.path.getmtime(os.path.join(UPLOAD_DIR, f)))
+        for f in os.listdir(UPLOAD_DIR)
+        if pathlib.Path(f).suffix.lower() in (".xlsx", ".xls", ".parquet")
+    ))
+    cached = st.session_state.get("duck")
+    if cached is None or cached[2] != key:
+        if cached is not None:
+            cached[0].close()
+        con = duckdb.connect(database=":memory:")
+        st.session_state.duck = (con, register_excel_tables(con, excel_paths), key)
+    con, table_map, _ = st.session_state.duck
+    return con, table_map
+
+def parse_one(path: str, use_ocr: bool = False) -> tuple[list[str], list[str]]:
+    """Extract and chunk a single uploaded file. Returns (chunks, sources)."""
+    p = pathlib.Path(path)
+    chunks, sources = [], []
+    if p.suffix.lower() == ".pdf":
+        if fitz is not None:
+            with fitz.open(path) as doc:
+                full_text = [pg.get_text("text") for pg in doc]
+        else:
+            reader = PdfReader(path)
+            full_text = [page.extract_text() or "" for page in reader.pages]
+        text = "\n".join(full_text).strip()
+        if use_ocr and not text:
+            text = ocr_pdf(path)
+
+        # simple chunking for the index
+        for ck in window_chunks(text, 180, 30):
+            chunks.append(ck)
+            sources.append(f"{p.name} (PDF)")
+
+    elif p.suffix.lower() in (".xlsx", ".xls"):
+        excel_to_parquet(path)
+        text = excel_to_text(path)
+        for ck in window_chunks(text, 220, 40):
+            chunks.append(ck)
+            sources.append(f"{p.name} (Excel)")
+    return chunks, sources
+
+def file_digest(data) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def load_manifest() -> dict:
+    try:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(manifest: dict):
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+def load_chunk_cache() -> dict:
+    """Chunks from the previous build as {(digest, use_ocr): (chunks, sources)}."""
+    if not os.path.exists(CHUNK_CACHE_PATH):
+        return {}
+    import pyarrow.parquet as pq
+    cols = pq.read_table(CHUNK_CACHE_PATH).to_pydict()
+    cache = {}
+    for digest, ocr, chunk, source in zip(cols["digest"], cols["ocr"], cols["chunk"], cols["source"]):
+        file_chunks, file_sources = cache.setdefault((digest, ocr), ([], []))
+        file_chunks.append(chunk)
+        file_sources.append(source)
+    return cache
+
+def embed_chunks(chunks, batch_size: int = 64):
+    """Encode all chunks in batches with the retriever's embedding model."""
+    import torch
+    with torch.inference_mode():
+        embs = _emb().encode(
+            chunks,
+            batch_size=batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+    return embs.astype("float32")
+
+def compact_dense_index(embs):
+    """Re-index embeddings in a compressed FAISS index.
+
+    Large corpora use IVF-PQ (nlist=sqrt(N), M=d/4, 8-bit codes); smaller ones
+    use fp16 scalar quantization, which halves the flat index size with
+    negligible recall loss.
+    """
+    import faiss
+    import numpy as np
+    vecs = np.ascontiguousarray(embs, dtype="float32")
+    n, d = vecs.shape
+    if n > IVFPQ_MIN_CHUNKS:
+        nlist = int(np.sqrt(n))
+        m = d // 4 if d % 4 == 0 else d
+        index = faiss.index_factory(d, f"IVF{nlist},PQ{m}x8", faiss.METRIC_INNER_PRODUCT)
+    else:
+        index = faiss.index_factory(d, "SQfp16", faiss.METRIC_INNER_PRODUCT)
+    index.train(vecs)
+    index.add(vecs)
+    if n > IVFPQ_MIN_CHUNKS:
+        index.nprobe = max(1, nlist // 16)
+    return index
 
 # ------- Page / Sidebar -------
 st.set_page_config(page_title="RAG Chat Agent (Gemini)", layout="wide")
@@ -42,64 +249,75 @@ with st.sidebar:
         os.makedirs(INDEX_DIR, exist_ok=True)
 
         # Save newly uploaded files (if any). If none this time, reuse existing.
+        # Files whose bytes match the manifest are neither rewritten nor re-parsed.
+        manifest = load_manifest()
         saved_paths = []
         if uploaded_files:
             for uf in uploaded_files:
                 out_path = os.path.join(UPLOAD_DIR, uf.name)
-                with open(out_path, "wb") as f:
-                    f.write(uf.read())
+                digest = file_digest(uf.getbuffer())
+                if manifest.get(uf.name) != digest or not os.path.exists(out_path):
+                    with open(out_path, "wb") as f:
+                        f.write(uf.getbuffer())
+                    manifest[uf.name] = digest
                 saved_paths.append(out_path)
         else:
-            saved_paths = [os.path.join(UPLOAD_DIR, p) for p in os.listdir(UPLOAD_DIR)]
-
-        chunks, sources = [], []
-
+            saved_paths = [
+                os.path.join(UPLOAD_DIR, p) for p in os.listdir(UPLOAD_DIR)
+                if pathlib.Path(p).suffix.lower() in (".pdf", ".xlsx", ".xls")
+            ]
+            for path in saved_paths:
+                name = os.path.basename(path)
+                if name not in manifest:
+                    manifest[name] = file_digest(pathlib.Path(path).read_bytes())
+        save_manifest(manifest)
+
+        chunk_cache = load_chunk_cache()
+        per_file = {}
+        to_parse = []
         for path in saved_paths:
-            p = pathlib.Path(path)
-            try:
-                if p.suffix.lower() == ".pdf":
-                    reader = PdfReader(path)
-                    full_text = []
-                    for page in reader.pages:
-                        txt = page.extract_text() or ""
-                        full_text.append(txt)
-                    text = "\n".join(full_text).strip()
-                    if use_ocr and not text:
-                        text = ocr_pdf(path)
-
-                    # simple chunking for the index
-                    words = text.split()
-                    size, overlap = 180, 30
-                    i = 0
-                    while i < len(words):
-                        ck = " ".join(words[i:i + size]).strip()
-                        if ck:
-                            chunks.append(ck)
-                            sources.append(f"{p.name} (PDF)")
-                        i += size - overlap
-
-                elif p.suffix.lower() in (".xlsx", ".xls"):
-                    text = excel_to_text(path)
-                    words = text.split()
-                    size, overlap = 220, 40
-                    i = 0
-                    while i < len(words):
-                        ck = " ".join(words[i:i + size]).strip()
-                        if ck:
-                            chunks.append(ck)
-                            sources.append(f"{p.name} (Excel)")
-                        i += size - overlap
-            except Exception as e:
-                st.error(f"Failed to parse {p.name}: {e}")
+            hit = chunk_cache.get((manifest[os.path.basename(path)], use_ocr))
+            if hit is not None:
+                per_file[path] = hit
+            else:
+                to_parse.append(path)
+
+        # Parsing is dominated by native PDF/Excel readers, so files are
+        # processed in parallel; the FAISS build below stays single-threaded.
+        if to_parse:
+            with ThreadPoolExecutor(max_workers=min(8, len(to_parse))) as pool:
+                futures = {pool.submit(parse_one, path, use_ocr): path for path in to_parse}
+                for fut in as_completed(futures):
+                    try:
+                        per_file[futures[fut]] = fut.result()
+                    except Exception as e:
+                        st.error(f"Failed to parse {pathlib.Path(futures[fut]).name}: {e}")
+
+        chunks, sources, digests = [], [], []
+        for path in saved_paths:
+            if path not in per_file:
+                continue
+            file_chunks, file_sources = per_file[path]
+            chunks.extend(file_chunks)
+            sources.extend(file_sources)
+            digests.extend([manifest[os.path.basename(path)]] * len(file_chunks))
 
         if not chunks:
             st.warning("No content to index. Upload files first.")
         else:
             import faiss
-            index, _ = build_dense_index(chunks)
+            index = compact_dense_index(embed_chunks(chunks, batch_size=64))
             faiss.write_index(index, os.path.join(INDEX_DIR, "index.faiss"))
-            with open(os.path.join(INDEX_DIR, "meta.pkl"), "wb") as f:
-                pickle.dump({"chunks": chunks, "sources": sources}, f)
+            meta = pa.Table.from_pydict({"chunk": chunks, "source": sources})
+            with pa.OSFile(os.path.join(INDEX_DIR, "meta.arrow"), "wb") as sink:
+                with pa.ipc.new_file(sink, meta.schema) as writer:
+                    writer.write_table(meta)
+            import pyarrow.parquet as pq
+            pq.write_table(
+                meta.append_column("digest", pa.array(digests))
+                .append_column("ocr", pa.array([use_ocr] * len(chunks))),
+                CHUNK_CACHE_PATH,
+            )
             st.success(f"Indexed {len(chunks)} chunks from {len(saved_paths)} files.")
 
 # ------- Header / Controls -------
@@ -135,6 +353,20 @@ PERSONA_SYSTEM = {
     ),
 }
 
+# Full system prompts per persona, assembled once instead of on every turn
+RAG_SYSTEM = {
+    p: v
+    + " Cite sources by filename in [brackets]. "
+    + "If the answer is not present in the context, say you cannot find it."
+    for p, v in PERSONA_SYSTEM.items()
+}
+SQL_SYSTEM = {
+    p: v
+    + " You must first output ONLY a valid DuckDB SQL query to answer the user's question, no commentary. "
+    + "Avoid backticks and code fences."
+    for p, v in PERSONA_SYSTEM.items()
+}
+
 # ------- Session State for Chat -------
 if "messages" not in st.session_state:
     st.session_state.messages = []  # list of dicts: {role: "user"|"assistant", "content": str}
@@ -149,52 +381,108 @@ def render_history():
 render_history()
 
 # ------- Helpers -------
-def load_index_or_warn():
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _load_index(idx_path: str, meta_path: str, mtime: float):
+    # `mtime` is only part of the cache key so a rebuilt index is reloaded.
+    import faiss
+    index = faiss.read_index(idx_path)
+    # Memory-mapped Arrow IPC: columns are zero-copy views over the file.
+    table = pa.ipc.open_file(pa.memory_map(meta_path)).read_all()
+    # BM25 in hybrid_search scores every chunk, so that column is needed as
+    # Python strings; sources stay in Arrow and are taken per hit.
+    meta = {"chunks": table.column("chunk").to_pylist(), "sources": table.column("source")}
+    return index, meta
+
+def index_mtime():
+    """Newest mtime of the on-disk index files, or None if either is missing."""
     idx_path = os.path.join(INDEX_DIR, "index.faiss")
-    meta_path = os.path.join(INDEX_DIR, "meta.pkl")
+    meta_path = os.path.join(INDEX_DIR, "meta.arrow")
     if not (os.path.exists(idx_path) and os.path.exists(meta_path)):
+        return None
+    return max(os.path.getmtime(idx_path), os.path.getmtime(meta_path))
+
+def load_index_or_warn(mtime=None):
+    mtime = mtime if mtime is not None else index_mtime()
+    if mtime is None:
         st.error("Index not found. Upload files and click (Re)build Index first.")
         return None, None
-    import faiss
-    index = faiss.read_index(idx_path)
-    with open(meta_path, "rb") as f:
-        meta = pickle.load(f)
-    return index, meta
+    return _load_index(
+        os.path.join(INDEX_DIR, "index.faiss"), os.path.join(INDEX_DIR, "meta.arrow"), mtime
+    )
 
-def persona_prefix():
-    return PERSONA_SYSTEM.get(persona, PERSONA_SYSTEM["General Employee"])
+def persona_prefix(persona_key=None):
+    return PERSONA_SYSTEM.get(persona_key or persona, PERSONA_SYSTEM["General Employee"])
 
-def answer_with_rag(user_text: str):
-    index, meta = load_index_or_warn()
-    if index is None:
-        return "I can’t find an index yet. Please (Re)build Index from the sidebar.", []
+@st.cache_data(ttl=ANSWER_CACHE_TTL, max_entries=ANSWER_CACHE_MAX, show_spinner=False)
+def _rag_prompt(user_text: str, persona_key: str, mtime: float):
+    # Pure function of (question, persona, index version): repeat questions
+    # skip retrieval and reranking entirely.
+    index, meta = load_index_or_warn(mtime)
 
     reranked = hybrid_search(index, meta["chunks"], user_text, top_k=8)
+    ids = [int(i) for i, _ in reranked]
+    hit_sources = meta["sources"].take(ids).to_pylist()
     hits = []
-    for i, score in reranked:
+    for (i, score), source in zip(reranked, hit_sources):
         hits.append({
             "score": float(score),
             "text": meta["chunks"][i],
-            "source": meta["sources"][i]
+            "source": source
         })
 
     context = "\n\n".join([f"[Source: {h['source']}]\n{h['text']}" for h in hits])
 
-    system = (
-        persona_prefix()
-        + " Cite sources by filename in [brackets]. "
-        + "If the answer is not present in the context, say you cannot find it."
-    )
+    system = RAG_SYSTEM.get(persona_key, RAG_SYSTEM["General Employee"])
     user_prompt = f"Question: {user_text}\n\nContext:\n{context}\n\nAnswer succinctly with citations."
 
-    reply = gemini_chat(
-        messages=[
-            {"role": "system", "content": system},
-            {"role": "user", "content": user_prompt},
-        ]
-    )
+    messages = [
+        {"role": "system", "content": system},
+        {"role": "user", "content": user_prompt},
+    ]
     cites = sorted({h["source"].split(" (")[0] for h in hits})
-    return reply, cites
+    return messages, cites
+
+@st.cache_resource(show_spinner=False)
+def _answer_cache():
+    """Process-wide LRU {(question, persona, mtime): (stored_at, reply, cites)} and its lock.
+
+    Shared by every session thread; replies stream to the user, so they are
+    stored here once complete rather than through st.cache_data.
+    """
+    return OrderedDict(), threading.Lock()
+
+def answer_with_rag(user_text: str):
+    """Returns (reply, cites); reply is a str on a cache hit, else a stream of text deltas."""
+    mtime = index_mtime()
+    if mtime is None:
+        st.error("Index not found. Upload files and click (Re)build Index first.")
+        return "I can’t find an index yet. Please (Re)build Index from the sidebar.", []
+    question = user_text.strip()
+    if not question:
+        return "Please type a question.", []
+
+    key = (question, persona, mtime)
+    cache, lock = _answer_cache()
+    with lock:
+        hit = cache.get(key)
+        if hit and time.time() - hit[0] < ANSWER_CACHE_TTL:
+            cache.move_to_end(key)
+            return hit[1], hit[2]
+
+    messages, cites = _rag_prompt(question, persona, mtime)
+
+    def stream():
+        parts = []
+        for delta in gemini_chat_stream(messages):
+            parts.append(delta)
+            yield delta
+        with lock:
+            cache[key] = (time.time(), "".join(parts), cites)
+            cache.move_to_end(key)
+            while len(cache) > ANSWER_CACHE_MAX:
+                cache.popitem(last=False)
+
+    return stream(), cites
 
 def answer_with_sql(user_text: str):
     excel_paths = [
@@ -204,19 +492,14 @@ def answer_with_sql(user_text: str):
     if not excel_paths:
         return "No Excel files uploaded. Upload .xlsx/.xls and try again.", []
 
-    con = duckdb.connect(database=":memory:")
-    table_map = excel_to_duckdb(con, excel_paths)
+    con, table_map = duck_connection(excel_paths)
 
     schema_describe = []
     for t, origin in table_map.items():
         df = con.sql(f"SELECT * FROM {t} LIMIT 5").df()
         schema_describe.append(f"Table {t} (from {origin}) Columns: {', '.join(map(str, df.columns))}")
 
-    system = (
-        persona_prefix()
-        + " You must first output ONLY a valid DuckDB SQL query to answer the user's question, no commentary. "
-        + "Avoid backticks and code fences."
-    )
+    system = SQL_SYSTEM.get(persona, SQL_SYSTEM["General Employee"])
     prompt = (
         "Return ONLY a valid DuckDB SQL that answers the question. "
         "Available tables and sample schemas:\n"
@@ -236,31 +519,29 @@ def answer_with_sql(user_text: str):
     if low.startswith("sql"):
         sql = sql.split("\n", 1)[1] if "\n" in sql else ""
 
+    # Only the first rows feed the summary, so fetch just those instead of
+    # materializing the whole result before Gemini can start.
     try:
-        df = con.sql(sql).df()
+        df = con.sql(sql).limit(10).df()
     except Exception as e:
         return f"SQL execution failed: {e}\n\nGenerated SQL:\n{sql}", []
 
     # Summarize result for the persona
-    preview_md = df.head(10).to_markdown(index=False)
-    summary = gemini_chat(
-        messages=[
-            {"role": "system", "content": persona_prefix()},
-            {"role": "user", "content": f"Explain the SQL result briefly for the intended audience.\nSQL:\n{sql}\n\nSample rows:\n{preview_md}"}
-        ]
-    )
+    preview_md = df_to_md(df)
+    summary_messages = [
+        {"role": "system", "content": persona_prefix()},
+        {"role": "user", "content": f"Explain the SQL result briefly for the intended audience.\nSQL:\n{sql}\n\nSample rows:\n{preview_md}"}
+    ]
+
+    def stream():
+        yield "**SQL Result (first rows shown in app):**\n\n"
+        yield from gemini_chat_stream(summary_messages)
 
     table_files = sorted({p.split(os.sep)[-1] for p in excel_paths})
-    reply = f"**SQL Result (first rows shown in app):**\n\n{summary}"
-    return reply, table_files
+    return stream(), table_files
 
 # ------- Chat Input -------
-def gemini_chat(messages, model: str = MODEL_NAME, temperature: float = 0.2) -> str:
-    """
-    Simple wrapper around Gemini chat API.
-    messages = list of {"role": "system"|"user"|"assistant", "content": str}
-    Returns: string content of response.
-    """
+def _gemini_history(messages):
     # Convert to Gemini's format
     history = []
     for m in messages:
@@ -269,11 +550,32 @@ def gemini_chat(messages, model: str = MODEL_NAME, temperature: float = 0.2) ->
         elif m["role"] in ("assistant", "system"):
             # Gemini doesn't have system role directly, we prepend it as assistant
             history.append({"role": "model", "parts": [m["content"]]})
+    return history
 
+def gemini_chat(messages, model: str = MODEL_NAME, temperature: float = 0.2) -> str:
+    """
+    Simple wrapper around Gemini chat API.
+    messages = list of {"role": "system"|"user"|"assistant", "content": str}
+    Returns: string content of response.
+    """
     model_obj = genai.GenerativeModel(model)
-    resp = model_obj.generate_content(history, generation_config={"temperature": temperature})
+    resp = model_obj.generate_content(_gemini_history(messages), generation_config={"temperature": temperature})
     return resp.text.strip() if resp and hasattr(resp, "text") else ""
 
+def gemini_chat_stream(messages, model: str = MODEL_NAME, temperature: float = 0.2):
+    """
+    Streaming variant of gemini_chat.
+    Yields text deltas as Gemini produces them.
+    """
+    model_obj = genai.GenerativeModel(model)
+    resp = model_obj.generate_content(
+        _gemini_history(messages), generation_config={"temperature": temperature}, stream=True
+    )
+    for chunk in resp:
+        text = getattr(chunk, "text", "")
+        if text:
+            yield text
+
 user_text = st.chat_input(
     "Ask your question...",
     max_chars=2000
@@ -290,19 +592,19 @@ if user_text:
         with st.spinner("Thinking..."):
             if mode == "Hybrid (RAG + Gemini)":
                 reply, citations = answer_with_rag(user_text)
-                st.write(reply)
-                if citations:
-                    st.caption("Sources: " + " • ".join(citations))
-                st.session_state.messages.append(
-                    {"role": "assistant", "content": reply, "citations": citations}
-                )
+                caption = "Sources: "
             else:
                 reply, citations = answer_with_sql(user_text)
-                st.write(reply)
-                if citations:
-                    st.caption("Excel tables: " + " • ".join(citations))
-                st.session_state.messages.append(
-                    {"role": "assistant", "content": reply, "citations": citations}
-                )
+                caption = "Excel tables: "
+        # Stream tokens as they arrive; write_stream returns the full text for history.
+        if isinstance(reply, str):
+            st.write(reply)
+        else:
+            reply = st.write_stream(reply)
+        if citations:
+            st.caption(caption + " • ".join(citations))
+        st.session_state.messages.append(
+            {"role": "assistant", "content": reply, "citations": citations}
+        )
 
 st.caption("Gemini chat agent with personas • RAG (BM25 + Dense + Rerank) • Excel SQL via DuckDB • OCR optional")
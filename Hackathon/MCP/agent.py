@@ -1,89 +1,304 @@
 import asyncio
-import aiohttp
-import json
-from openai import OpenAI
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+import httpx
+import orjson
+from openai import AsyncOpenAI
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse
 from typing import Dict, List, Any, Optional
-from models.data_models import WorkflowRequest, WorkflowResponse, SystemHealthStatus
+from models.data_models import (
+    WorkflowRequest, WorkflowResponse, SystemHealthStatus, MaintenanceAnalysis, ChatMessage, ChatResponse
+)
 from health_check import HealthChecker, health_router
 from approval_workflow import approval_router
-from config.settings import DatabaseConfig
-import re
+from config.settings import DatabaseConfig, MCP_SERVER_URLS
+try:
+    import re2 as re  # google-re2: linear-time matching, drop-in for these patterns
+except ImportError:
+    import re
 import logging
 import os
-import uuid
+import random
+import time
+from collections import OrderedDict
+try:
+    import uvloop  # faster event loop for sockets and task scheduling
+    uvloop.install()
+except ImportError:
+    pass
 
-app = FastAPI(title="MCP Workflow Agent")
+# Equipment identifiers such as "pump-002", compiled once at import
+_EQUIP_RE = re.compile(r"(?i)\b(pump|valve|motor|compressor)-(\d{3})\b")
+# Approval codes issued by process_maintenance_request: WO-<workorder_id>-APPROVAL
+_APPROVAL_RE = re.compile(r"WO-(\w+)-APPROVAL")
+
+# Analyses cached per (equipment_id, normalized issue) to skip repeat GPT calls
+ANALYSIS_CACHE_MAX = 4096
+ANALYSIS_CACHE_TTL = 3600  # seconds
+_WS_RE = re.compile(r"\s+")
+
+# Bounded MCP timeouts so a hung server fails fast instead of pinning a connection
+_MCP_TIMEOUT = httpx.Timeout(5.0, connect=1.0, read=4.0)
+_JSON_HEADERS = {"Content-Type": "application/json"}
+# Health probes must answer quickly; a hung server is reported as down
+HEALTH_PROBE_TIMEOUT = 1.5  # seconds, per HTTP attempt
+HEALTH_CHECK_TIMEOUT = 2.0  # seconds, per system including retries
+
+# Upper bound on distinct item codes accepted by one inventory check
+MAX_INVENTORY_ITEMS = 500
+
+# Process-wide HTTP/2-capable MCP client; concurrent calls to one server share its pool
+_mcp_http = httpx.AsyncClient(
+    http2=True,
+    timeout=_MCP_TIMEOUT,
+    limits=httpx.Limits(max_connections=200, max_keepalive_connections=100, keepalive_expiry=60),
+)
+
+# Templated requests that can be routed without an LLM round-trip. Checked in
+# order: the loose health pattern goes last so "pump-002 health sensor failed"
+# is treated as a maintenance request.
+_INTENT_PATTERNS = [
+    (re.compile(r"(?i)\blist\b.*\bwork\s*orders?\b"), "list_workorders"),
+    (re.compile(r"(?i)\b([a-z]+-\d+)\b.*\b(not working|broken|failed)\b"), "process_maintenance"),
+    (re.compile(r"(?i)\bhealth\b"), "health_check"),
+]
+_SYSTEM_RE = re.compile(r"(?i)\b(inventory|workorders|permits|hr)\b")
+_STATUS_RE = re.compile(r"(?i)\b(open|assigned|in_progress|completed|cancelled)\b")
+
+def match_intent(message: str) -> Optional[tuple]:
+    """Return (function_name, function_args) for an obvious intent, else None"""
+    for pattern, function_name in _INTENT_PATTERNS:
+        match = pattern.search(message)
+        if not match:
+            continue
+        if function_name == "health_check":
+            system = _SYSTEM_RE.search(message)
+            return function_name, {"system": system.group(1).lower() if system else "all"}
+        if function_name == "list_workorders":
+            status = _STATUS_RE.search(message)
+            return function_name, {"status": status.group(1).lower()} if status else {}
+        return function_name, {"equipment_id": match.group(1).lower(), "issue_description": message}
+    return None
+
+# Bounded parallelism: at most this many OpenAI calls in flight per process,
+# and per MCP server; connect failures are retried with exponential backoff.
+OPENAI_CONCURRENCY = 10
+MCP_CONCURRENCY = 32
+MCP_RETRIES = 3
+_openai_slots = asyncio.Semaphore(OPENAI_CONCURRENCY)
+
+# Admission control for the LLM-heavy endpoints: requests beyond the limit
+# wait in line and get a 504 if no slot frees up within the queue timeout.
+# The limit is per process, which is why the agent runs a single worker.
+ADMISSION_ENDPOINTS = frozenset({"/api/chat", "/api/workflow/process"})
+ADMISSION_CONCURRENCY = 10
+ADMISSION_QUEUE_TIMEOUT = 30.0  # seconds
+_admission_slots = asyncio.Semaphore(ADMISSION_CONCURRENCY)
+
+# One OpenAI client (and connection pool) per process, shared by every agent
+_openai_client: Optional[AsyncOpenAI] = None
+
+def shared_openai_client(api_key: str) -> AsyncOpenAI:
+    """Get or create the process-wide OpenAI client"""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = AsyncOpenAI(
+            api_key=api_key,
+            max_retries=3,  # SDK retries 429/5xx/timeouts with jittered exponential backoff
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+            ),
+        )
+    return _openai_client
+
+# Static system prompt: kept byte-identical across calls so OpenAI can cache the prefix
+_SYSTEM_PROMPT = """\
+You are an intelligent maintenance workflow agent for an industrial facility.
+Your capabilities include:
+
+1. Health Monitoring: Check status of inventory, workorders, permits, and HR systems
+2. Workflow Management: Process maintenance requests from start to finish
+3. Approval Handling: Manage workflow approvals when required
+4. Natural Language Processing: Understand maintenance requests in plain English
+
+Workflow Steps:
+- Receive maintenance request (e.g., "pump-002 is not working")
+- Check for existing work orders
+- Analyze required parts using AI
+- Check inventory availability
+- Identify required permits
+- Find available qualified personnel
+- Create work order with all details
+- Request approval if needed
+- Execute the workflow
+
+Always provide clear, structured responses and indicate when approval is required.
+"""
+
+# Tool schemas offered to the model, built once at import. A tuple so the
+# spec cannot be mutated in place and stays byte-identical for prompt caching.
+_TOOL_SCHEMAS = (
+    {
+        "type": "function",
+        "function": {
+            "name": "health_check",
+            "description": "Check system health status",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "system": {
+                        "type": "string",
+                        "enum": ["all", "inventory", "workorders", "permits", "hr"],
+                        "description": "System to check"
+                    }
+                }
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "process_maintenance",
+            "description": "Process a maintenance request",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "equipment_id": {"type": "string", "description": "Equipment identifier"},
+                    "issue_description": {"type": "string", "description": "Description of the issue"},
+                    "priority": {"type": "string", "enum": ["low", "medium", "high", "critical"]}
+                },
+                "required": ["equipment_id", "issue_description"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "check_inventory",
+            "description": "Check inventory for specific items",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "item_codes": {
+                        "type": "array", 
+                        "items": {"type": "string"},
+                        "description": "List of item codes to check"
+                    }
+                }
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "list_workorders",
+            "description": "List workorders with optional filters",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "status": {"type": "string", "enum": ["open", "assigned", "in_progress", "completed", "cancelled"]},
+                    "priority": {"type": "string", "enum": ["low", "medium", "high", "critical"]}
+                }
+            }
+        }
+    }
+)
+
+app = FastAPI(title="MCP Workflow Agent", default_response_class=ORJSONResponse)
 app.include_router(health_router, prefix="/api")
 app.include_router(approval_router, prefix="/api")
 
-class ChatMessage(BaseModel):
-    message: str
-    user_id: Optional[str] = "user"
-    session_id: Optional[str] = None
-
-class ChatResponse(BaseModel):
-    response: str
-    requires_approval: bool = False
-    approval_code: Optional[str] = None
-    actions: List[str] = []
-    details: Dict[str, Any] = {}
+@app.middleware("http")
+async def admission_control(request: Request, call_next):
+    """Bound concurrent chat/workflow requests instead of queueing them all at OpenAI"""
+    if request.url.path not in ADMISSION_ENDPOINTS:
+        return await call_next(request)
+    # asyncio.timeout rather than wait_for: on 3.11 wait_for can time out after
+    # the acquire already succeeded, leaking the slot (gh-86296)
+    try:
+        async with asyncio.timeout(ADMISSION_QUEUE_TIMEOUT):
+            await _admission_slots.acquire()
+    except TimeoutError:
+        return ORJSONResponse(
+            status_code=504,
+            content={"detail": "Server busy, request timed out waiting for capacity"}
+        )
+    try:
+        return await call_next(request)
+    finally:
+        _admission_slots.release()
 
 class WorkflowAgent:
     def __init__(self, openai_api_key: str):
-        self.client = OpenAI(api_key="sk-proj-nEoPoNyY90k5vK8leVNFoIku8dbiF5s4DTKpBVYs56QdVJnJfeaxlnAPivk1-jRKZEoJlXwXrVT3BlbkFJT1kFVKSl6tcVzjoUv75J-xcc0E04lBw4CBNYcyrDjSFt3YfEFig3Q2Zl6hb653LxwhTVlzR1g")
+        self.client = shared_openai_client(openai_api_key)
         self.health_checker = HealthChecker()
-        self.mcp_servers = {
-            "inventory": "http://localhost:8002",
-            "workorders": "http://localhost:8003",
-            "permits": "http://localhost:8001",
-            "hr": "http://localhost:8004"
+        self.mcp_servers = dict(MCP_SERVER_URLS)
+        self._mcp_keys = tuple(self.mcp_servers)
+        self._mcp_slots = {k: asyncio.Semaphore(MCP_CONCURRENCY) for k in self.mcp_servers}
+        # Recent health results per `system` arg; concurrent probes share one fan-out
+        self._health_cache: Dict[str, tuple] = {}
+        self._health_lock = asyncio.Lock()
+        self._health_ttl = 0.2
+        # Chat tool name -> handler taking the tool arguments
+        self._dispatch = {
+            "health_check": lambda a: self.health_check(a.get("system", "all")),
+            "process_maintenance": self.process_maintenance_request,
+            "check_inventory": lambda a: self.check_inventory(a.get("item_codes", [])),
+            "list_workorders": self.list_workorders,
         }
+        self.http = _mcp_http
         
         # Setup logging
         self.logger = logging.getLogger(__name__)
         
+        # LRU of (stored_at, serialized analysis); decoding per hit hands out a fresh dict
+        self._analysis_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._cache_counts = {"hits": 0, "misses": 0}
+        # In-flight routing calls keyed by message text
+        self._inflight_routes: Dict[str, asyncio.Future] = {}
+        
         self.setup_system_prompt()
     
+    @property
+    def cache_stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size of the analysis cache"""
+        return {**self._cache_counts, "size": len(self._analysis_cache)}
+    
     def setup_system_prompt(self):
-        self.system_prompt = """
-        You are an intelligent maintenance workflow agent for an industrial facility.
-        Your capabilities include:
-        
-        1. Health Monitoring: Check status of inventory, workorders, permits, and HR systems
-        2. Workflow Management: Process maintenance requests from start to finish
-        3. Approval Handling: Manage workflow approvals when required
-        4. Natural Language Processing: Understand maintenance requests in plain English
-        
-        Workflow Steps:
-        - Receive maintenance request (e.g., "pump-002 is not working")
-        - Check for existing work orders
-        - Analyze required parts using AI
-        - Check inventory availability
-        - Identify required permits
-        - Find available qualified personnel
-        - Create work order with all details
-        - Request approval if needed
-        - Execute the workflow
-        
-        Always provide clear, structured responses and indicate when approval is required.
-        """
+        self.system_prompt = _SYSTEM_PROMPT
     
-    async def call_mcp_server(self, server: str, endpoint: str, method: str = "POST", params: Dict = None):
-        """Make calls to MCP servers"""
+    async def close(self):
+        """Close the shared HTTP client"""
+        await self.http.aclose()
+    
+    async def call_mcp_server(self, server: str, endpoint: str, method: str = "POST", params: Dict = None,
+                              timeout: Optional[float] = None):
+        """Make calls to MCP servers, optionally with a tighter total timeout"""
         url = f"{self.mcp_servers[server]}{endpoint}"
+        request_timeout = _MCP_TIMEOUT if timeout is None else timeout
         
         try:
-            async with aiohttp.ClientSession() as session:
-                if method.upper() == "POST":
-                    async with session.post(url, json=params) as response:
-                        return await response.json()
-                else:
-                    async with session.get(url) as response:
-                        return await response.json()
+            async with self._mcp_slots[server]:
+                for attempt in range(MCP_RETRIES):
+                    try:
+                        if method.upper() == "POST":
+                            response = await self.http.request("POST", url, content=orjson.dumps(params),
+                                                               headers=_JSON_HEADERS, timeout=request_timeout)
+                        else:
+                            response = await self.http.request("GET", url, timeout=request_timeout)
+                        break
+                    except (httpx.ConnectError, httpx.ConnectTimeout):
+                        # Nothing reached the server, so even a POST is safe to resend
+                        if attempt == MCP_RETRIES - 1:
+                            raise
+                        await asyncio.sleep(0.5 * 2 ** attempt + random.uniform(0, 0.1))
+            response.raise_for_status()
+            return orjson.loads(response.content)
+        except httpx.HTTPStatusError as e:
+            # Error responses are reported without decoding their body
+            self.logger.error("%s server returned %s", server, e.response.status_code)
+            return {"error": f"{server} server returned HTTP {e.response.status_code}"}
         except Exception as e:
-            self.logger.error(f"Error calling {server} server: {str(e)}")
+            self.logger.error("Error calling %s server: %s", server, e)
             return {"error": str(e)}
     
     async def check_inventory(self, item_codes: List[str]) -> Dict[str, Any]:
@@ -93,107 +308,78 @@ class WorkflowAgent:
                 "method": "check",
                 "params": {
                     "item_codes": item_codes,
-                    "quantities": {code: 1 for code in item_codes}
+                    "quantities": dict.fromkeys(item_codes, 1)
                 }
             })
             return result
         except Exception as e:
-            self.logger.error(f"Error checking inventory: {str(e)}")
+            self.logger.error("Error checking inventory: %s", e)
             return {"error": str(e)}
 
-    async def process_chat_message(self, message: str) -> ChatResponse:
-        """Process natural language chat messages"""
-        try:
-            # Use OpenAI to analyze the message and determine intent
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
+    async def _route_completion(self, message: str):
+        async with _openai_slots:
+            response = await self.client.chat.completions.create(
+                model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": self.system_prompt},
                     {"role": "user", "content": f"Analyze this message and determine the action: {message}"}
                 ],
-                functions=[
-                    {
-                        "name": "health_check",
-                        "description": "Check system health status",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "system": {
-                                    "type": "string",
-                                    "enum": ["all", "inventory", "workorders", "permits", "hr"],
-                                    "description": "System to check"
-                                }
-                            }
-                        }
-                    },
-                    {
-                        "name": "process_maintenance",
-                        "description": "Process a maintenance request",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "equipment_id": {"type": "string", "description": "Equipment identifier"},
-                                "issue_description": {"type": "string", "description": "Description of the issue"},
-                                "priority": {"type": "string", "enum": ["low", "medium", "high", "critical"]}
-                            },
-                            "required": ["equipment_id", "issue_description"]
-                        }
-                    },
-                    {
-                        "name": "check_inventory",
-                        "description": "Check inventory for specific items",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "item_codes": {
-                                    "type": "array", 
-                                    "items": {"type": "string"},
-                                    "description": "List of item codes to check"
-                                }
-                            }
-                        }
-                    },
-                    {
-                        "name": "list_workorders",
-                        "description": "List workorders with optional filters",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "status": {"type": "string", "enum": ["open", "assigned", "in_progress", "completed", "cancelled"]},
-                                "priority": {"type": "string", "enum": ["low", "medium", "high", "critical"]}
-                            }
-                        }
-                    }
-                ],
-                function_call="auto"
+                tools=_TOOL_SCHEMAS,
+                tool_choice="auto",
+                # Pins requests with the same static prefix to the same cache
+                extra_body={"prompt_cache_key": "mcp-agent-v1"}
             )
+        return response.choices[0].message
+    
+    async def route_with_llm(self, message: str):
+        """Ask the model how to handle `message`.
+        
+        Identical messages arriving while a call is in flight wait for that call
+        instead of issuing their own; each caller still runs its own tool call.
+        """
+        pending = self._inflight_routes.get(message)
+        if pending is None:
+            pending = asyncio.ensure_future(self._route_completion(message))
+            self._inflight_routes[message] = pending
+            pending.add_done_callback(lambda _: self._inflight_routes.pop(message, None))
+        return await asyncio.shield(pending)
+    
+    async def _run_tool(self, function_name: str, function_args: Dict[str, Any]) -> ChatResponse:
+        """Execute one tool call and wrap its result for the chat client"""
+        handler = self._dispatch.get(function_name)
+        if handler is not None:
+            result = await handler(function_args)
+        else:
+            result = {"response": f"Function {function_name} not implemented"}
+        
+        if isinstance(result, WorkflowResponse):
+            return ChatResponse(
+                response=result.message,
+                requires_approval=result.requires_approval,
+                approval_code=result.approval_code,
+                actions=result.actions_taken,
+                details=result.details
+            )
+        return ChatResponse(
+            response=result.get("response", "Action completed"),
+            requires_approval=result.get("requires_approval", False),
+            approval_code=result.get("approval_code"),
+            actions=result.get("actions", []),
+            details=result.get("details", {})
+        )
+    
+    async def process_chat_message(self, message: str) -> ChatResponse:
+        """Process natural language chat messages"""
+        try:
+            # Templated requests skip the OpenAI round-trip entirely
+            routed = match_intent(message)
+            if routed:
+                return await self._run_tool(*routed)
             
-            message_response = response.choices[0].message
+            # Use OpenAI to analyze the message and determine intent
+            message_response = await self.route_with_llm(message)
             
-            if message_response.function_call:
-                function_name = message_response.function_call.name
-                function_args = json.loads(message_response.function_call.arguments)
-                
-                # Execute the appropriate function
-                if function_name == "health_check":
-                    result = await self.health_check(function_args.get("system", "all"))
-                elif function_name == "process_maintenance":
-                    result = await self.process_maintenance_request(function_args)
-                elif function_name == "check_inventory":
-                    result = await self.check_inventory(function_args.get("item_codes", []))
-                elif function_name == "list_workorders":
-                    result = await self.list_workorders(function_args)
-                else:
-                    result = {"response": f"Function {function_name} not implemented"}
-                
-                return ChatResponse(
-                    response=result.get("response", "Action completed"),
-                    requires_approval=result.get("requires_approval", False),
-                    approval_code=result.get("approval_code"),
-                    actions=result.get("actions", []),
-                    details=result.get("details", {})
-                )
-            else:
+            if not message_response.tool_calls:
                 # No function call needed, return the AI's response directly
                 return ChatResponse(
                     response=message_response.content,
@@ -201,9 +387,27 @@ class WorkflowAgent:
                     actions=[],
                     details={}
                 )
+            
+            calls = [
+                (tc.function.name, orjson.loads(tc.function.arguments))
+                for tc in message_response.tool_calls
+            ]
+            if len(calls) == 1:
+                return await self._run_tool(*calls[0])
+            
+            # Parallel tool calls from one completion run together, so a
+            # multi-step request costs a single model round-trip.
+            results = await asyncio.gather(*(self._run_tool(name, args) for name, args in calls))
+            return ChatResponse(
+                response="\n".join(r.response for r in results),
+                requires_approval=any(r.requires_approval for r in results),
+                approval_code=next((r.approval_code for r in results if r.approval_code), None),
+                actions=[action for r in results for action in r.actions],
+                details={name: r.details for (name, _), r in zip(calls, results)}
+            )
                 
         except Exception as e:
-            self.logger.error(f"Error processing chat message: {str(e)}")
+            self.logger.error("Error processing chat message: %s", e)
             return ChatResponse(
                 response=f"Error processing your request: {str(e)}",
                 requires_approval=False,
@@ -212,21 +416,45 @@ class WorkflowAgent:
             )
     
     async def health_check(self, system: str = "all") -> Dict[str, Any]:
-        """Check health of MCP servers"""
+        """Check health of MCP servers, reusing a result younger than the TTL"""
+        cached = self._health_cache.get(system)
+        if cached and time.monotonic() - cached[0] < self._health_ttl:
+            return cached[1]
+        async with self._health_lock:
+            cached = self._health_cache.get(system)
+            if cached and time.monotonic() - cached[0] < self._health_ttl:
+                return cached[1]
+            result = await self._probe_health(system)
+            self._health_cache[system] = (time.monotonic(), result)
+            return result
+    
+    async def _probe_health(self, system: str) -> Dict[str, Any]:
+        """Query the /health endpoint of the requested MCP servers"""
         health_results = {}
         
-        systems_to_check = []
-        if system == "all":
-            systems_to_check = list(self.mcp_servers.keys())
-        else:
-            systems_to_check = [system]
+        systems_to_check = self._mcp_keys if system == "all" else (system,)
         
-        for sys in systems_to_check:
-            try:
-                result = await self.call_mcp_server(sys, "/health", "GET")
+        # Probe all systems concurrently; each probe is bounded on its own so
+        # one hung server cannot hide the results of the others
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(
+                    self.call_mcp_server(sys, "/health", "GET", timeout=HEALTH_PROBE_TIMEOUT),
+                    HEALTH_CHECK_TIMEOUT
+                )
+                for sys in systems_to_check
+            ),
+            return_exceptions=True
+        )
+        for sys, result in zip(systems_to_check, results):
+            if isinstance(result, asyncio.TimeoutError):
+                health_results[sys] = {"status": "down", "error": "health probe timed out"}
+            elif isinstance(result, Exception):
+                health_results[sys] = {"status": "down", "error": str(result)}
+            elif "error" in result and "status" not in result:
+                health_results[sys] = {"status": "down", **result}
+            else:
                 health_results[sys] = result
-            except Exception as e:
-                health_results[sys] = {"status": "error", "error": str(e)}
         
         all_healthy = all(
             result.get("status") in ["healthy", "up"] 
@@ -239,124 +467,163 @@ class WorkflowAgent:
             "details": health_results,
             "all_healthy": all_healthy
         }
-    async def process_maintenance_request(self, params: Dict[str, Any]) -> Dict[str, Any]:
+    async def process_maintenance_request(self, params: Dict[str, Any]) -> WorkflowResponse:
         """Process a maintenance workflow request"""
         try:
             equipment_id = params.get("equipment_id")
             issue_description = params.get("issue_description")
+            if not equipment_id and issue_description:
+                # Fall back to an ID mentioned in the description itself
+                match = _EQUIP_RE.search(issue_description)
+                if match:
+                    equipment_id = match.group(0).lower()
             priority = params.get("priority", "medium")
             
-            self.logger.info(f"Processing maintenance request for {equipment_id}: {issue_description}")
+            self.logger.info("Processing maintenance request for %s: %s", equipment_id, issue_description)
             
             # Step 1: Analyze the issue to determine required parts and skills
             analysis_result = await self.analyze_maintenance_issue(issue_description, equipment_id)
             required_parts = analysis_result.get("required_parts", {})
             required_skills = analysis_result.get("required_skills", [])
             
-            # Step 2: Check inventory availability
-            inventory_result = await self.check_inventory(list(required_parts.keys()))
-            
-            # Step 3: Check for available employees with required skills
-            hr_result = await self.call_mcp_server("hr", "/mcp/hr/available_employees", "POST", {
-                "method": "available_employees",
-                "params": {
-                    "required_skills": required_skills,
-                    "max_workload": 2
-                }
-            })
-            
-            # Step 4: Create workorder
-            workorder_result = await self.call_mcp_server("workorders", "/mcp/workorders/create", "POST", {
-                "method": "create",
+            # Steps 2-4 (inventory, available personnel, workorder creation) are
+            # bundled server-side so the workflow costs a single MCP round-trip.
+            bootstrap = await self.call_mcp_server("workorders", "/mcp/workflow/bootstrap", "POST", {
+                "method": "bootstrap",
                 "params": {
                     "equipment_id": equipment_id,
                     "description": issue_description,
                     "priority": priority,
-                    "estimated_hours": analysis_result.get("estimated_hours", 4.0)
+                    "estimated_hours": analysis_result.get("estimated_hours", 4.0),
+                    "required_parts": required_parts,
+                    "required_skills": required_skills
                 }
             })
+            bootstrap_result = bootstrap.get("result") or {}
+            workorder_id = bootstrap_result.get("workorder_id")
+            inventory_status = bootstrap_result.get("inventory_status") or {}
+            available_employees = bootstrap_result.get("available_employees") or []
+            bootstrap_errors = bootstrap_result.get("errors") or {}
+            actions_taken = ["Issue analyzed"]
+            if bootstrap_result and "inventory" not in bootstrap_errors:
+                actions_taken.append("Inventory checked")
+            if bootstrap_result and "hr" not in bootstrap_errors:
+                actions_taken.append("Personnel availability verified")
+            
+            if workorder_id is None:
+                error = bootstrap_errors.get("workorders") or bootstrap.get("error") or "no workorder ID returned"
+                self.logger.error("Workorder creation failed for %s: %s", equipment_id, error)
+                return WorkflowResponse(
+                    success=False,
+                    message=f"Failed to create workorder for {equipment_id}: {error}",
+                    actions_taken=actions_taken,
+                    details={
+                        "equipment_id": equipment_id,
+                        "error": error,
+                        "bootstrap_errors": bootstrap_errors,
+                        "analysis": analysis_result
+                    }
+                )
+            actions_taken.append("Workorder created")
             
-            workorder_id = workorder_result.get("result", {}).get("workorder_id")
+            # Units still missing per part after what is on hand
+            on_hand = inventory_status.get("available_items") or {}
+            part_shortfalls = {}
+            for code, qty in required_parts.items():
+                missing = qty - on_hand.get(code, {}).get("available_quantity", 0)
+                if missing > 0:
+                    part_shortfalls[code] = missing
             
             # Determine if approval is needed based on priority and cost
-            requires_approval = priority in ["high", "critical"] or len(required_parts) > 5
+            requires_approval = priority in ("high", "critical") or len(required_parts) > 5
+            message = f"Maintenance workflow initiated for {equipment_id}"
+            approval_code = None
+            if requires_approval:
+                approval_code = f"WO-{workorder_id}-APPROVAL"
+                message += f". Approval required: {approval_code}"
             
-            response_data = {
-                "response": f"Maintenance workflow initiated for {equipment_id}",
-                "requires_approval": requires_approval,
-                "details": {
+            return WorkflowResponse(
+                success=True,
+                workorder_id=str(workorder_id),
+                message=message,
+                actions_taken=actions_taken,
+                requires_approval=requires_approval,
+                approval_code=approval_code,
+                details={
                     "equipment_id": equipment_id,
                     "workorder_id": workorder_id,
                     "required_parts": required_parts,
                     "required_skills": required_skills,
-                    "inventory_status": inventory_result.get("result", {}),
-                    "available_employees": hr_result.get("result", {}).get("available_employees", []),
+                    "inventory_status": inventory_status,
+                    "available_employees": available_employees,
+                    "part_shortfalls": part_shortfalls,
+                    "bootstrap_errors": bootstrap_errors,
                     "analysis": analysis_result
-                },
-                "actions": [
-                    "Issue analyzed",
-                    "Inventory checked",
-                    "Personnel availability verified",
-                    "Workorder created"
-                ]
-            }
-            
-            if requires_approval:
-                approval_code = f"WO-{workorder_id}-APPROVAL"
-                response_data["approval_code"] = approval_code
-                response_data["response"] += f". Approval required: {approval_code}"
-            
-            return response_data
+                }
+            )
             
         except Exception as e:
-            self.logger.error(f"Error processing maintenance request: {str(e)}")
-            return {
-                "response": f"Error processing maintenance request: {str(e)}",
-                "requires_approval": False,
-                "details": {"error": str(e)}
-            }
+            self.logger.error("Error processing maintenance request: %s", e)
+            return WorkflowResponse(
+                success=False,
+                message=f"Error processing maintenance request: {str(e)}",
+                details={"error": str(e)}
+            )
     
     async def analyze_maintenance_issue(self, issue_description: str, equipment_id: str) -> Dict[str, Any]:
         """Use AI to analyze maintenance issue and determine requirements"""
-        try:
-            prompt = f"""
-            Analyze this maintenance issue and determine what's needed:
-            
-            Equipment: {equipment_id}
-            Issue: {issue_description}
-            
-            Provide a JSON response with:
-            - required_parts: dictionary of part codes and quantities needed
-            - required_skills: list of skills needed for the repair
-            - estimated_hours: estimated time to complete
-            - risk_level: low, medium, high, critical
-            - special_requirements: any special tools or safety requirements
-            
-            Base your analysis on typical industrial maintenance knowledge.
-            """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
+        key = (
+            (equipment_id or "").strip().lower(),
+            _WS_RE.sub(" ", (issue_description or "").strip().lower())
+        )
+        cached = self._analysis_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < ANALYSIS_CACHE_TTL:
+            self._analysis_cache.move_to_end(key)
+            self._cache_counts["hits"] += 1
+            return orjson.loads(cached[1])
+        self._cache_counts["misses"] += 1
+        
+        prompt = f"""
+        Analyze this maintenance issue and determine what's needed:
+        
+        Equipment: {equipment_id}
+        Issue: {issue_description}
+        
+        Base your analysis on typical industrial maintenance knowledge.
+        """
+        
+        # Structured output: the SDK validates the reply against the schema
+        async with _openai_slots:
+            response = await self.client.beta.chat.completions.parse(
+                model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "You are an industrial maintenance expert. Analyze maintenance issues and provide structured responses."},
                     {"role": "user", "content": prompt}
                 ],
-                response_format={"type": "json_object"}
+                response_format=MaintenanceAnalysis,
+                temperature=0  # deterministic output so cached answers match fresh ones
             )
-            
-            analysis = json.loads(response.choices[0].message.content)
-            return analysis
-            
-        except Exception as e:
-            self.logger.error(f"Error analyzing maintenance issue: {str(e)}")
-            # Fallback analysis
-            return {
-                "required_parts": {"GASKET-001": 1, "BOLT-002": 4},
-                "required_skills": ["mechanical", "troubleshooting"],
-                "estimated_hours": 4.0,
-                "risk_level": "medium",
-                "special_requirements": ["safety glasses", "gloves"]
-            }
+        
+        parsed = response.choices[0].message.parsed
+        if parsed is None:
+            raise ValueError(f"Model returned no analysis: {response.choices[0].message.refusal}")
+        
+        analysis = parsed.model_dump()
+        # Canonical part codes (inventory item IDs are lower case); repeats add up
+        parts = {}
+        for p in parsed.required_parts:
+            if p.quantity < 1:
+                self.logger.warning("Ignoring part %s with non-positive quantity %s", p.part_code, p.quantity)
+                continue
+            code = p.part_code.strip().lower()
+            parts[code] = parts.get(code, 0) + p.quantity
+        analysis["required_parts"] = parts
+        
+        self._analysis_cache[key] = (time.monotonic(), orjson.dumps(analysis))
+        self._analysis_cache.move_to_end(key)
+        if len(self._analysis_cache) > ANALYSIS_CACHE_MAX:
+            self._analysis_cache.popitem(last=False)
+        return analysis
     async def list_workorders(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """List workorders with optional filters"""
         try:
@@ -369,14 +636,14 @@ class WorkflowAgent:
                 "details": result.get("result", {})
             }
         except Exception as e:
-            self.logger.error(f"Error listing workorders: {str(e)}")
+            self.logger.error("Error listing workorders: %s", e)
             return {"response": f"Error listing workorders: {str(e)}", "details": {}}
     
     async def execute_approved_workflow(self, approval_code: str) -> Dict[str, Any]:
         """Execute a workflow after approval"""
         try:
             # Extract workorder ID from approval code
-            match = re.search(r"WO-(\w+)-APPROVAL", approval_code)
+            match = _APPROVAL_RE.match(approval_code)
             if not match:
                 return {"success": False, "error": "Invalid approval code"}
             
@@ -403,7 +670,7 @@ class WorkflowAgent:
             }
             
         except Exception as e:
-            self.logger.error(f"Error executing approved workflow: {str(e)}")
+            self.logger.error("Error executing approved workflow: %s", e)
             return {"success": False, "error": str(e)}
 
 # Initialize the agent globally
@@ -419,6 +686,23 @@ def get_agent():
         agent_instance = WorkflowAgent(openai_api_key)
     return agent_instance
 
+@app.on_event("startup")
+async def startup_agent():
+    """Create the agent and its connection pool before the first request"""
+    logging.getLogger(__name__).info(
+        "Event loop policy: %s", type(asyncio.get_event_loop_policy()).__name__
+    )
+    try:
+        get_agent()
+    except ValueError as e:
+        logging.getLogger(__name__).warning("Workflow agent not started: %s", e)
+
+@app.on_event("shutdown")
+async def shutdown_agent():
+    """Release the agent's pooled HTTP connections"""
+    if agent_instance is not None:
+        await agent_instance.close()
+
 # FastAPI endpoints
 @app.post("/api/chat", response_model=ChatResponse)
 async def chat_endpoint(chat_message: ChatMessage):
@@ -447,23 +731,11 @@ async def process_workflow(workflow_request: WorkflowRequest):
     """Process a maintenance workflow"""
     try:
         agent = get_agent()
-        result = await agent.process_maintenance_request(workflow_request.dict())
-        
-        return WorkflowResponse(
-            success=True,
-            message=result.get("response", "Workflow processed"),
-            workflow_id=result.get("details", {}).get("workorder_id", str(uuid.uuid4())),
-            requires_approval=result.get("requires_approval", False),
-            approval_code=result.get("approval_code"),
-            details=result.get("details", {})
-        )
+        return await agent.process_maintenance_request(workflow_request.model_dump())
     except Exception as e:
         return WorkflowResponse(
             success=False,
             message=f"Error processing workflow: {str(e)}",
-            workflow_id=None,
-            requires_approval=False,
-            approval_code=None,
             details={"error": str(e)}
         )
 
@@ -487,12 +759,33 @@ async def systems_health():
     except Exception as e:
         return {"error": str(e)}
 
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Hit/miss counters for the maintenance analysis cache"""
+    try:
+        agent = get_agent()
+        return agent.cache_stats
+    except Exception as e:
+        return {"error": str(e)}
+
 @app.get("/api/inventory/check")
 async def check_inventory_endpoint(item_codes: str):
     """Check inventory endpoint"""
+    # Trim, normalise and dedupe the codes; sorted so identical requests
+    # always reach the inventory server with identical payloads
+    raw = item_codes.split(",")
+    items = sorted({code.strip().lower() for code in raw if code.strip()})
+    if len(items) > MAX_INVENTORY_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many item codes: {len(items)} (maximum {MAX_INVENTORY_ITEMS})"
+        )
+    if items and len(raw) > 1.5 * len(items):
+        logging.getLogger(__name__).warning(
+            "Inventory check deduplicated %d item codes to %d", len(raw), len(items)
+        )
     try:
         agent = get_agent()
-        items = item_codes.split(",")
         result = await agent.check_inventory(items)
         return result
     except Exception as e:
@@ -500,4 +793,14 @@ async def check_inventory_endpoint(item_codes: str):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(
+        "agent:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",
+        http="httptools",
+        # Single worker: pending approvals, the analysis cache and the
+        # admission limit are per-process state. Scale out only once they
+        # move to a shared store.
+        workers=1
+    )
@@ -1,14 +1,31 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
+from collections import defaultdict
+from operator import itemgetter
 from datetime import datetime
+from types import MappingProxyType
 from models.data_models import PermitStatus, SystemHealthStatus, SystemHealth
+import base64
+import itertools
+import secrets
+import struct
 import time
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 # In-memory storage for permits (in production, use database)
 permits_db = {}
+# Secondary indexes: permit IDs per status and per workorder, kept as dicts
+# (insertion-ordered sets) so listings come back in a stable order. Handlers
+# never await between updating permits_db and these, so they stay consistent
+# without a lock; blocking storage added later must go through run_in_threadpool.
+permits_by_status: Dict[str, Dict[str, None]] = defaultdict(dict)
+permits_by_workorder: Dict[str, Dict[str, None]] = defaultdict(dict)
+# Unfiltered permit listing, rebuilt lazily after a permit is added. The permit
+# dicts themselves are shared, so status updates show up without invalidation.
+_all_permits_snapshot: Optional[List[Dict[str, Any]]] = None
 permit_rules_db = {
     "pump": {
         "maintenance": ["work-permit"],
@@ -26,6 +43,26 @@ permit_rules_db = {
         "installation": ["electrical-permit", "work-permit"]
     }
 }
+# Flattened view of the rules for single-lookup access: (equipment, work) -> permits
+_flat_rules = {
+    (equipment, work): permits
+    for equipment, rules in permit_rules_db.items()
+    for work, permits in rules.items()
+}
+_valid_equipment = frozenset(permit_rules_db)
+
+# Status values, resolved from the enum once
+_STATUS_DRAFT = PermitStatus.DRAFT.value
+_STATUS_SUBMITTED = PermitStatus.SUBMITTED.value
+_STATUS_APPROVED = PermitStatus.APPROVED.value
+
+# Estimated approval time by urgency
+_APPROVAL_TIMES = MappingProxyType({
+    "emergency": "1 hour",
+    "high": "4 hours",
+    "normal": "24 hours",
+    "low": "48 hours"
+})
 
 class PermitRequest(BaseModel):
     workorder_id: str
@@ -41,6 +78,26 @@ class PermitResponse(BaseModel):
     submitted_date: Optional[datetime] = None
     estimated_approval_time: Optional[str] = None
 
+# Low 20 bits of each permit ID's time part: a per-process sequence number
+_id_counter = itertools.count()
+
+def _new_permit_id() -> str:
+    """Unique, time-sortable permit ID: base32hex of (unix seconds << 20 | sequence)
+    followed by 32 random bits, so IDs from separate worker processes don't collide"""
+    packed = struct.pack(
+        ">QI",
+        (int(time.time()) << 20) | (next(_id_counter) & 0xFFFFF),
+        secrets.randbits(32)
+    )
+    return "PERMIT-" + base64.b32hexencode(packed).rstrip(b"=").decode()
+
+def _set_status(permit_id: str, status: str):
+    """Change a permit's status and move it to the matching status bucket"""
+    permit = permits_db[permit_id]
+    permits_by_status[permit["status"]].pop(permit_id, None)
+    permit["status"] = status
+    permits_by_status[status][permit_id] = None
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint for permit system"""
@@ -69,14 +126,14 @@ async def get_required_permits(equipment_type: str, work_type: str):
     equipment_type = equipment_type.lower()
     work_type = work_type.lower()
     
-    if equipment_type not in permit_rules_db:
+    if equipment_type not in _valid_equipment:
         raise HTTPException(status_code=404, detail=f"Equipment type '{equipment_type}' not found")
     
-    if work_type not in permit_rules_db[equipment_type]:
+    required_permits = _flat_rules.get((equipment_type, work_type))
+    if required_permits is None:
         # Default to maintenance if work type not found
         work_type = "maintenance"
-    
-    required_permits = permit_rules_db[equipment_type].get(work_type, ["work-permit"])
+        required_permits = _flat_rules.get((equipment_type, work_type), ["work-permit"])
     
     return {
         "equipment_type": equipment_type,
@@ -89,37 +146,35 @@ async def get_required_permits(equipment_type: str, work_type: str):
 @router.post("/permits", response_model=PermitResponse)
 async def create_permit(request: PermitRequest):
     """Create a new permit request"""
-    permit_id = f"PERMIT-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+    global _all_permits_snapshot
+    now = datetime.now()
+    permit_id = _new_permit_id()
     
     # Determine estimated approval time based on urgency
-    approval_times = {
-        "emergency": "1 hour",
-        "high": "4 hours", 
-        "normal": "24 hours",
-        "low": "48 hours"
-    }
-    
-    estimated_time = approval_times.get(request.urgency, "24 hours")
+    estimated_time = _APPROVAL_TIMES.get(request.urgency, "24 hours")
     
     permit_data = {
         "permit_id": permit_id,
         "workorder_id": request.workorder_id,
         "permit_type": request.permit_type,
         "description": request.description,
-        "status": PermitStatus.DRAFT.value,
+        "status": _STATUS_DRAFT,
         "required_documents": request.required_documents,
         "urgency": request.urgency,
-        "created_date": datetime.now(),
+        "created_date": now,
         "estimated_approval_time": estimated_time
     }
     
     permits_db[permit_id] = permit_data
+    permits_by_status[permit_data["status"]][permit_id] = None
+    permits_by_workorder[request.workorder_id][permit_id] = None
+    _all_permits_snapshot = None
     
     return PermitResponse(
         permit_id=permit_id,
-        status=PermitStatus.DRAFT.value,
+        status=_STATUS_DRAFT,
         message=f"Permit {permit_id} created successfully",
-        submitted_date=datetime.now(),
+        submitted_date=now,
         estimated_approval_time=estimated_time
     )
 
@@ -129,14 +184,15 @@ async def submit_permit(permit_id: str):
     if permit_id not in permits_db:
         raise HTTPException(status_code=404, detail="Permit not found")
     
-    permits_db[permit_id]["status"] = PermitStatus.SUBMITTED.value
-    permits_db[permit_id]["submitted_date"] = datetime.now()
+    now = datetime.now()
+    _set_status(permit_id, _STATUS_SUBMITTED)
+    permits_db[permit_id]["submitted_date"] = now
     
     return {
         "permit_id": permit_id,
-        "status": "submitted",
+        "status": _STATUS_SUBMITTED,
         "message": "Permit submitted for approval",
-        "submitted_date": datetime.now().isoformat()
+        "submitted_date": now
     }
 
 @router.put("/permits/{permit_id}/approve")
@@ -145,16 +201,17 @@ async def approve_permit(permit_id: str, approver: str, comments: Optional[str]
     if permit_id not in permits_db:
         raise HTTPException(status_code=404, detail="Permit not found")
     
-    permits_db[permit_id]["status"] = PermitStatus.APPROVED.value
-    permits_db[permit_id]["approved_date"] = datetime.now()
+    now = datetime.now()
+    _set_status(permit_id, _STATUS_APPROVED)
+    permits_db[permit_id]["approved_date"] = now
     permits_db[permit_id]["approver"] = approver
     permits_db[permit_id]["approver_comments"] = comments
     
     return {
         "permit_id": permit_id,
-        "status": "approved",
+        "status": _STATUS_APPROVED,
         "approver": approver,
-        "approval_date": datetime.now().isoformat(),
+        "approval_date": now,
         "message": "Permit approved successfully"
     }
 
@@ -169,16 +226,30 @@ async def get_permit(permit_id: str):
 @router.get("/permits")
 async def list_permits(status: Optional[str] = None, workorder_id: Optional[str] = None):
     """List permits with optional filtering"""
-    filtered_permits = permits_db.values()
-    
-    if status:
-        filtered_permits = [p for p in filtered_permits if p["status"] == status]
-    
-    if workorder_id:
-        filtered_permits = [p for p in filtered_permits if p["workorder_id"] == workorder_id]
+    global _all_permits_snapshot
+    # One specialised path per filter combination, chosen once per request.
+    # Results keep creation order: workorder buckets are filled at creation,
+    # while status buckets are in transition order and get sorted.
+    if status and workorder_id:
+        by_status = permits_by_status.get(status, {})
+        filtered_permits = [
+            permits_db[permit_id] for permit_id in permits_by_workorder.get(workorder_id, ())
+            if permit_id in by_status
+        ]
+    elif status:
+        filtered_permits = sorted(
+            (permits_db[permit_id] for permit_id in permits_by_status.get(status, ())),
+            key=itemgetter("created_date")
+        )
+    elif workorder_id:
+        filtered_permits = [permits_db[permit_id] for permit_id in permits_by_workorder.get(workorder_id, ())]
+    else:
+        if _all_permits_snapshot is None:
+            _all_permits_snapshot = list(permits_db.values())
+        filtered_permits = _all_permits_snapshot
     
     return {
-        "permits": list(filtered_permits),
+        "permits": filtered_permits,
         "count": len(filtered_permits),
         "filters": {
             "status": status,
@@ -191,5 +262,5 @@ async def get_permit_rules():
     """Get all permit rules"""
     return {
         "permit_rules": permit_rules_db,
-        "last_updated": datetime.now().isoformat()
+        "last_updated": datetime.now()
     }
@@ -1,14 +1,78 @@
+"""Simulated .NET Core permit management API.
+
+Permits live in a SQLite database (WAL mode) rather than process memory, so
+several workers can serve the API and see the same permits:
+
+    gunicorn api.net_api_simulator:app -k uvicorn.workers.UvicornWorker -w $((2*$(nproc)+1)) --preload
+"""
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
+import os
+import secrets
+import sqlite3
+import time
+from types import MappingProxyType
 import uvicorn
 from models.data_models import Permit, PermitStatus
+try:
+    import uvloop  # faster event loop for sockets and task scheduling
+    uvloop.install()
+except ImportError:
+    pass
+
+PERMITS_DB_PATH = os.getenv("PERMITS_DB_PATH", "permits.db")
+
+# Required permits per (equipment type, work type); read-only and built once
+PERMIT_RULES = MappingProxyType({
+    ("pump", "maintenance"): ("work-permit",),
+    ("pump", "repair"): ("hot-work-permit", "safety-permit"),
+    ("pump", "installation"): ("work-permit", "safety-permit"),
+    ("valve", "maintenance"): ("work-permit",),
+    ("valve", "repair"): ("pressure-permit", "safety-permit"),
+    ("motor", "maintenance"): ("work-permit",),
+    ("motor", "repair"): ("electrical-permit", "safety-permit"),
+})
+DEFAULT_PERMITS = ("work-permit",)
 
-app = FastAPI(title="Permit Management API", description="Simulated .NET Core API for Permit Management")
+db: Optional[sqlite3.Connection] = None
 
-# In-memory storage for permits
-permits_db = {}
+def open_permit_store(path: str = PERMITS_DB_PATH) -> sqlite3.Connection:
+    """Open the shared permit store, creating the table on first use"""
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS permits (
+            permit_id TEXT PRIMARY KEY,
+            workorder_id TEXT NOT NULL,
+            permit_type TEXT NOT NULL,
+            status TEXT NOT NULL,
+            required INTEGER NOT NULL,
+            submitted_date TEXT,
+            approved_date TEXT,
+            approver TEXT
+        )
+    """)
+    return conn
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global db
+    db = open_permit_store()
+    yield
+    db.close()
+
+app = FastAPI(
+    title="Permit Management API",
+    description="Simulated .NET Core API for Permit Management",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
 
 class PermitRequest(BaseModel):
     workorder_id: str
@@ -29,23 +93,7 @@ async def health_check():
 @app.get("/api/permits/required/{equipment_type}")
 async def get_required_permits(equipment_type: str, work_type: str):
     """Get required permits for equipment type and work type"""
-    permit_rules = {
-        "pump": {
-            "maintenance": ["work-permit"],
-            "repair": ["hot-work-permit", "safety-permit"],
-            "installation": ["work-permit", "safety-permit"]
-        },
-        "valve": {
-            "maintenance": ["work-permit"],
-            "repair": ["pressure-permit", "safety-permit"]
-        },
-        "motor": {
-            "maintenance": ["work-permit"],
-            "repair": ["electrical-permit", "safety-permit"]
-        }
-    }
-    
-    required_permits = permit_rules.get(equipment_type, {}).get(work_type, ["work-permit"])
+    required_permits = PERMIT_RULES.get((equipment_type, work_type), DEFAULT_PERMITS)
     
     return {
         "equipment_type": equipment_type,
@@ -57,7 +105,9 @@ async def get_required_permits(equipment_type: str, work_type: str):
 @app.post("/api/permits", response_model=PermitResponse)
 async def create_permit(request: PermitRequest):
     """Create a new permit request"""
-    permit_id = f"PERMIT-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+    # Second-resolution timestamps collided under concurrent requests
+    permit_id = f"PERMIT-{time.time_ns():x}-{secrets.token_hex(3)}"
+    submitted_date = datetime.now(timezone.utc)
     
     permit = Permit(
         permit_id=permit_id,
@@ -65,10 +115,15 @@ async def create_permit(request: PermitRequest):
         permit_type=request.permit_type,
         status=PermitStatus.DRAFT,
         required=True,
-        submitted_date=datetime.now()
+        submitted_date=submitted_date
     )
     
-    permits_db[permit_id] = permit.dict()
+    db.execute(
+        "INSERT INTO permits (permit_id, workorder_id, permit_type, status, required, submitted_date) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (permit.permit_id, permit.workorder_id, permit.permit_type, permit.status.value,
+         int(permit.required), permit.submitted_date.isoformat())
+    )
     
     return PermitResponse(
         permit_id=permit_id,
@@ -80,12 +135,14 @@ async def create_permit(request: PermitRequest):
 @app.put("/api/permits/{permit_id}/submit")
 async def submit_permit(permit_id: str):
     """Submit permit for approval"""
-    if permit_id not in permits_db:
+    submitted_date = datetime.now(timezone.utc)
+    cur = db.execute(
+        "UPDATE permits SET status = ?, submitted_date = ? WHERE permit_id = ?",
+        (PermitStatus.SUBMITTED.value, submitted_date.isoformat(), permit_id)
+    )
+    if cur.rowcount == 0:
         raise HTTPException(status_code=404, detail="Permit not found")
     
-    permits_db[permit_id]['status'] = PermitStatus.SUBMITTED.value
-    permits_db[permit_id]['submitted_date'] = datetime.now()
-    
     return {
         "permit_id": permit_id,
         "status": "submitted",
@@ -95,13 +152,14 @@ async def submit_permit(permit_id: str):
 @app.put("/api/permits/{permit_id}/approve")
 async def approve_permit(permit_id: str, approver: str):
     """Approve a permit"""
-    if permit_id not in permits_db:
+    approved_date = datetime.now(timezone.utc)
+    cur = db.execute(
+        "UPDATE permits SET status = ?, approved_date = ?, approver = ? WHERE permit_id = ?",
+        (PermitStatus.APPROVED.value, approved_date.isoformat(), approver, permit_id)
+    )
+    if cur.rowcount == 0:
         raise HTTPException(status_code=404, detail="Permit not found")
     
-    permits_db[permit_id]['status'] = PermitStatus.APPROVED.value
-    permits_db[permit_id]['approved_date'] = datetime.now()
-    permits_db[permit_id]['approver'] = approver
-    
     return {
         "permit_id": permit_id,
         "status": "approved",
@@ -112,10 +170,20 @@ async def approve_permit(permit_id: str, approver: str):
 @app.get("/api/permits/{permit_id}")
 async def get_permit(permit_id: str):
     """Get permit details"""
-    if permit_id not in permits_db:
+    row = db.execute("SELECT * FROM permits WHERE permit_id = ?", (permit_id,)).fetchone()
+    if row is None:
         raise HTTPException(status_code=404, detail="Permit not found")
     
-    return permits_db[permit_id]
+    permit = dict(row)
+    permit["required"] = bool(permit["required"])
+    return permit
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+    uvicorn.run(
+        "api.net_api_simulator:app",
+        host="0.0.0.0",
+        port=8001,
+        loop="auto",
+        http="auto",
+        workers=(os.cpu_count() or 1) * 2 + 1
+    )
@@ -1,15 +1,19 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime, timedelta
 import hashlib
 import json
 from models.data_models import ApprovalRequest, ApprovalStatus, WorkflowResponse
 
-approval_router = APIRouter()
+approval_router = APIRouter(default_response_class=ORJSONResponse)
 
 # In-memory storage for approval requests (in production, use database)
 approval_requests: Dict[str, ApprovalRequest] = {}
+# Serialized pending requests by approval code; a request is dumped once when
+# created and dropped as soon as it is approved or rejected
+pending_approvals: Dict[str, Dict[str, Any]] = {}
 
 class ApprovalAction(BaseModel):
     approval_code: str
@@ -20,7 +24,7 @@ class ApprovalAction(BaseModel):
 def generate_approval_code(workorder_id: str, timestamp: datetime) -> str:
     """Generate unique approval code"""
     hash_input = f"{workorder_id}-{timestamp.isoformat()}"
-    return hashlib.md5(hash_input.encode()).hexdigest()[:8].upper()
+    return hashlib.blake2b(hash_input.encode(), digest_size=4).hexdigest().upper()
 
 @approval_router.post("/workflow/request-approval")
 async def request_approval(workorder_id: str, requested_by: str, approval_items: List[Dict[str, Any]]):
@@ -36,6 +40,7 @@ async def request_approval(workorder_id: str, requested_by: str, approval_items:
     )
     
     approval_requests[approval_code] = approval_request
+    pending_approvals[approval_code] = approval_request.model_dump()
     
     # In production, send email notification here
     
@@ -72,6 +77,7 @@ async def process_approval(action: ApprovalAction):
         raise HTTPException(status_code=400, detail="Invalid action. Use 'approve' or 'reject'")
     
     approval_request.comments = action.comments
+    pending_approvals.pop(action.approval_code, None)
     
     # Update work order status based on approval
     # This would typically call the workorders MCP server
@@ -87,10 +93,7 @@ async def process_approval(action: ApprovalAction):
 @approval_router.get("/approvals/pending")
 async def get_pending_approvals():
     """Get all pending approval requests"""
-    pending = [
-        request.dict() for request in approval_requests.values() 
-        if request.status == ApprovalStatus.PENDING
-    ]
+    pending = list(pending_approvals.values())
     
     return {
         "pending_approvals": pending,
@@ -32,6 +32,23 @@ SQL_SERVER_CONNECTION_STRING = (
     f"&driver=ODBC+Driver+17+for+SQL+Server"
 )
 
+# MCP server base URLs, shared by the agent and by servers that call their peers
+MCP_SERVER_URLS = {
+    "inventory": os.getenv("INVENTORY_MCP_URL", "http://localhost:8002"),
+    "workorders": os.getenv("WORKORDERS_MCP_URL", "http://localhost:8003"),
+    "permits": os.getenv("PERMITS_API_URL", "http://localhost:8001"),
+    "hr": os.getenv("HR_MCP_URL", "http://localhost:8004"),
+}
+
+# SQLAlchemy pool settings shared by the database engines: pre-ping drops dead
+# connections before use and recycling retires them before server-side timeouts
+SQL_ENGINE_POOL_OPTIONS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+    "pool_pre_ping": True,
+    "pool_recycle": 1800,
+}
+
 # PostgreSQL connection string
 POSTGRES_CONNECTION_STRING = (
     f"postgresql://{DatabaseConfig.POSTGRES_USER}:{DatabaseConfig.POSTGRES_PASSWORD}"
@@ -2,8 +2,14 @@ import sys
 import os
 import pyodbc
 import socket
+import json
+import tempfile
+import time
 import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
+from urllib.parse import quote_plus
+from sqlalchemy import create_engine
 
 # Add the parent directory to Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -20,16 +26,87 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Host resolutions are reused for RESOLVE_TTL seconds. Port probe results are
+# reused for PORT_PROBE_TTL seconds in-process and for PORT_PROBE_FILE_TTL
+# seconds across re-runs via a small file in the temp dir. Cache entries carry
+# their expiry time.
+RESOLVE_TTL = 300
+PORT_PROBE_TTL = 30
+PORT_PROBE_FILE_TTL = 60
+PORT_PROBE_CACHE_PATH = os.path.join(tempfile.gettempdir(), "sql_probe_cache.json")
+_resolve_cache = {}
+_port_probe_cache = {}
+
+# Candidate servers, tried with otherwise identical connection settings
+SQL_SERVER_CANDIDATES = [
+    "AVD116\\SQLEXPRESS",
+    "localhost\\SQLEXPRESS",
+    ".\\SQLEXPRESS",
+    "127.0.0.1\\SQLEXPRESS",
+    "AVD116,1433",
+]
+CONNECTION_STRING_TEMPLATE = (
+    "DRIVER={{ODBC Driver 18 for SQL Server}};SERVER={server};DATABASE={database};"
+    "Trusted_Connection=yes;TrustServerCertificate=yes;Connection Timeout=30;"
+)
+
+def resolve_host(host):
+    """Resolve a hostname, cached for RESOLVE_TTL seconds"""
+    now = time.time()
+    cached = _resolve_cache.get(host)
+    if cached and now < cached[0]:
+        return cached[1]
+    ip = socket.gethostbyname(host)
+    _resolve_cache[host] = (now + RESOLVE_TTL, ip)
+    return ip
+
+def _load_port_probe_file():
+    try:
+        with open(PORT_PROBE_CACHE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def port_open(host, port, timeout=5):
+    """TCP connect probe, cached in-process and in a short-lived file"""
+    key = f"{host}:{port}"
+    now = time.time()
+    cached = _port_probe_cache.get(key)
+    if cached and now < cached[0]:
+        return cached[1]
+    
+    entries = _load_port_probe_file()
+    entry = entries.get(key)
+    if entry and now < entry.get("expires", 0):
+        _port_probe_cache[key] = (min(entry["expires"], now + PORT_PROBE_TTL), entry["port_open"])
+        return entry["port_open"]
+    
+    # Resolve once and probe that address, so it is what gets cached
+    ip = resolve_host(host)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        is_open = sock.connect_ex((ip, port)) == 0
+    finally:
+        sock.close()
+    
+    _port_probe_cache[key] = (now + PORT_PROBE_TTL, is_open)
+    entries[key] = {"host": ip, "port_open": is_open, "expires": now + PORT_PROBE_FILE_TTL}
+    try:
+        with open(PORT_PROBE_CACHE_PATH, "w") as f:
+            json.dump(entries, f)
+    except OSError:
+        pass
+    return is_open
+
 class SQLServerSetup:
     def __init__(self):
         self.connection_strings = [
-            # Try different connection methods
-            f"DRIVER={{ODBC Driver 18 for SQL Server}};SERVER=AVD116\\SQLEXPRESS;DATABASE={DatabaseConfig.SQL_SERVER_DB};Trusted_Connection=yes;TrustServerCertificate=yes;Connection Timeout=30;",
-            f"DRIVER={{ODBC Driver 18 for SQL Server}};SERVER=localhost\\SQLEXPRESS;DATABASE={DatabaseConfig.SQL_SERVER_DB};Trusted_Connection=yes;TrustServerCertificate=yes;Connection Timeout=30;",
-            f"DRIVER={{ODBC Driver 18 for SQL Server}};SERVER=.\\SQLEXPRESS;DATABASE={DatabaseConfig.SQL_SERVER_DB};Trusted_Connection=yes;TrustServerCertificate=yes;Connection Timeout=30;",
-            f"DRIVER={{ODBC Driver 18 for SQL Server}};SERVER=127.0.0.1\\SQLEXPRESS;DATABASE={DatabaseConfig.SQL_SERVER_DB};Trusted_Connection=yes;TrustServerCertificate=yes;Connection Timeout=30;",
-            f"DRIVER={{ODBC Driver 18 for SQL Server}};SERVER=AVD116,1433;DATABASE={DatabaseConfig.SQL_SERVER_DB};Trusted_Connection=yes;TrustServerCertificate=yes;Connection Timeout=30;"
+            CONNECTION_STRING_TEMPLATE.format(server=server, database=DatabaseConfig.SQL_SERVER_DB)
+            for server in SQL_SERVER_CANDIDATES
         ]
+        # Pooled engine over the first connection string that works
+        self.engine = None
     
     def test_network_connectivity(self):
         """Test basic network connectivity to SQL Server"""
@@ -37,12 +114,12 @@ class SQLServerSetup:
         
         # Test server resolution
         try:
-            ip = socket.gethostbyname("AVD116")
+            ip = resolve_host("AVD116")
             print(f"✅ Server AVD116 resolved to: {ip}")
         except:
             print("❌ Cannot resolve AVD116, trying localhost...")
             try:
-                ip = socket.gethostbyname("localhost")
+                ip = resolve_host("localhost")
                 print(f"✅ localhost resolved to: {ip}")
             except:
                 print("❌ Cannot resolve localhost")
@@ -50,11 +127,7 @@ class SQLServerSetup:
         
         # Test port 1433
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(5)
-            result = sock.connect_ex(("localhost", 1433))
-            sock.close()
-            if result == 0:
+            if port_open("localhost", 1433):
                 print("✅ Port 1433 is open")
                 return True
             else:
@@ -72,48 +145,79 @@ class SQLServerSetup:
             print("Network connectivity failed. Check SQL Server service and firewall.")
             return False, "Network connectivity failed"
         
-        for i, conn_str in enumerate(self.connection_strings):
-            print(f"\nAttempt {i+1}: {conn_str.split(';')[1]}")  # Show SERVER part
+        # Race all candidates; the first one to connect wins
+        executor = ThreadPoolExecutor(max_workers=len(self.connection_strings))
+        try:
+            pending = set()
+            for i, conn_str in enumerate(self.connection_strings):
+                print(f"Attempt {i+1}: {conn_str.split(';')[1]}")  # Show SERVER part
+                pending.add(executor.submit(self._try_connect, conn_str))
             
-            try:
-                start_time = datetime.now()
-                conn = pyodbc.connect(conn_str, timeout=10)
-                cursor = conn.cursor()
-                cursor.execute("SELECT @@VERSION")
-                version = cursor.fetchone()
-                conn.close()
-                elapsed = (datetime.now() - start_time).total_seconds()
-                
-                print(f"✅ SUCCESS! Connection time: {elapsed:.2f}s")
-                print(f"SQL Server: {version[0][:100]}...")
-                
-                # Save working connection string
-                self.working_connection_string = conn_str
-                return True, f"Connected using: {conn_str.split(';')[1]}"
-                
-            except pyodbc.Error as e:
-                print(f"❌ Failed: {e}")
-            except Exception as e:
-                print(f"❌ Error: {e}")
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        conn_str, version, elapsed = future.result()
+                    except pyodbc.Error as e:
+                        print(f"❌ Failed: {e}")
+                        continue
+                    except Exception as e:
+                        print(f"❌ Error: {e}")
+                        continue
+                    
+                    print(f"\n✅ SUCCESS! {conn_str.split(';')[1]} Connection time: {elapsed:.2f}s")
+                    print(f"SQL Server: {version[0][:100]}...")
+                    
+                    # Save working connection string and pool connections to it
+                    self.working_connection_string = conn_str
+                    self.engine = create_engine(
+                        f"mssql+pyodbc:///?odbc_connect={quote_plus(conn_str)}",
+                        pool_size=5,
+                        max_overflow=0,
+                        pool_pre_ping=True
+                    )
+                    return True, f"Connected using: {conn_str.split(';')[1]}"
+        finally:
+            # Don't wait for slower probes still stuck in their connect timeout
+            executor.shutdown(wait=False, cancel_futures=True)
         
         return False, "All connection attempts failed"
     
+    @staticmethod
+    def _try_connect(conn_str):
+        """Open a connection, read the server version and close it again"""
+        start_time = datetime.now()
+        conn = pyodbc.connect(conn_str, timeout=10)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT @@VERSION")
+            version = cursor.fetchone()
+        finally:
+            conn.close()
+        elapsed = (datetime.now() - start_time).total_seconds()
+        return conn_str, version, elapsed
+    
     def create_inventory_schema(self):
         """Create inventory database schema using working connection"""
-        if not hasattr(self, 'working_connection_string'):
+        if self.engine is None:
             print("No working connection string available")
             return False
             
+        # Same statements as database/sql_server_setup.py. The engine already
+        # targets the inventory database, so no CREATE/USE DATABASE here.
+        from database.sql_server_setup import (
+            INVENTORY_TABLE_DDL, INVENTORY_TRANSACTIONS_TABLE_DDL,
+            SEED_INVENTORY_SQL, SEED_INVENTORY_PARAMS
+        )
+        
         try:
-            conn = pyodbc.connect(self.working_connection_string)
-            cursor = conn.cursor()
+            # One pooled connection and one transaction for the whole schema
+            with self.engine.begin() as conn:
+                conn.exec_driver_sql(INVENTORY_TABLE_DDL)
+                conn.exec_driver_sql(INVENTORY_TRANSACTIONS_TABLE_DDL)
+                conn.exec_driver_sql(SEED_INVENTORY_SQL, tuple(SEED_INVENTORY_PARAMS))
             
-            # Your schema creation code here...
-            # (Keep the existing schema creation code)
-            
-            conn.commit()
-            conn.close()
-            logger.info("SQL Server inventory schema created successfully")
+            logger.info("SQL Server inventory schema created successfully with sample data")
             return True
         except Exception as e:
             logger.error(f"Failed to create SQL Server schema: {str(e)}")
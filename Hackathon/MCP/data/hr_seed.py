@@ -0,0 +1,54 @@
+"""Sample HR records shared by the HR data generators"""
+from functools import lru_cache
+import pandas as pd
+
+HR_RECORDS = {
+    'employee_id': ['EMP001', 'EMP002', 'EMP003', 'EMP004', 'EMP005', 'EMP006', 'EMP007'],
+    'name': ['John Smith', 'Maria Garcia', 'David Lee', 'Sarah Chen', 'Robert Brown', 'Lisa Wilson', 'Michael Johnson'],
+    'department': ['Maintenance', 'Maintenance', 'Electrical', 'Mechanical', 'Maintenance', 'Electrical', 'Safety'],
+    'position': ['Technician', 'Senior Technician', 'Electrician', 'Mechanic', 'Supervisor', 'Senior Electrician', 'Safety Officer'],
+    'skills': [
+        'pump repair,mechanical,hydraulics',
+        'electrical,welding,control systems', 
+        'electrical,control systems,instrumentation',
+        'mechanical,hydraulics,pneumatics',
+        'supervision,planning,safety',
+        'electrical,high voltage,transformers',
+        'safety,compliance,training'
+    ],
+    'certifications': [
+        'Mechanical Technician, Safety Level 1',
+        'Electrical License, Welding Certified',
+        'Electrical Engineer, Instrumentation',
+        'Mechanical Engineer, Hydraulics',
+        'Supervisor Certified, Safety Level 3',
+        'High Voltage Certified, Electrical Master',
+        'Safety Officer, First Aid, CPR'
+    ],
+    'current_workload': [2, 1, 0, 3, 1, 2, 0],
+    'max_workload': [5, 5, 5, 5, 5, 5, 5],
+    'available': [True, True, True, False, True, True, True],
+    'email': [
+        'john.smith@company.com',
+        'maria.garcia@company.com', 
+        'david.lee@company.com',
+        'sarah.chen@company.com',
+        'robert.brown@company.com',
+        'lisa.wilson@company.com',
+        'michael.johnson@company.com'
+    ],
+    'phone': ['555-0101', '555-0102', '555-0103', '555-0104', '555-0105', '555-0106', '555-0107'],
+    'hire_date': [
+        '2020-03-15', '2019-07-22', '2021-01-10', '2018-11-05', '2017-05-30', '2019-09-12', '2022-02-28'
+    ],
+    'shift': ['Day', 'Night', 'Day', 'Day', 'Day', 'Night', 'Day']
+}
+
+@lru_cache(maxsize=1)
+def build_hr_dataframe() -> pd.DataFrame:
+    """Build the employee DataFrame once; callers must not mutate it"""
+    df = pd.DataFrame(HR_RECORDS)
+    # Native date cells instead of strings
+    df['hire_date'] = pd.to_datetime(df['hire_date'])
+    # Arrow-backed columns: strings without per-cell Python objects, typed ints/bools
+    return df.convert_dtypes(dtype_backend='pyarrow')
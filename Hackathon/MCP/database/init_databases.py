@@ -1,6 +1,7 @@
 import sys
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 # Add the parent directory to Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -10,11 +11,8 @@ from config.settings import DatabaseConfig
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def initialize_databases():
-    """Initialize all database systems"""
-    results = {}
-    
-    # 1. Initialize SQL Server (Inventory)
+def init_sql_server():
+    """Initialize SQL Server (Inventory)"""
     try:
         from database.sql_server_setup import SQLServerSetup
         sql_setup = SQLServerSetup()
@@ -22,20 +20,20 @@ def initialize_databases():
         
         if sql_success:
             schema_created = sql_setup.create_inventory_schema()
-            results['sql_server'] = {
+            logger.info("SQL Server initialized successfully")
+            return {
                 'status': 'success' if schema_created else 'schema_failed',
                 'message': sql_message
             }
-            logger.info("SQL Server initialized successfully")
-        else:
-            results['sql_server'] = {'status': 'failed', 'message': sql_message}
-            logger.error(f"SQL Server initialization failed: {sql_message}")
+        logger.error(f"SQL Server initialization failed: {sql_message}")
+        return {'status': 'failed', 'message': sql_message}
             
     except Exception as e:
-        results['sql_server'] = {'status': 'error', 'message': str(e)}
         logger.error(f"SQL Server error: {e}")
-    
-    # 2. Initialize PostgreSQL (WorkOrders)
+        return {'status': 'error', 'message': str(e)}
+
+def init_postgresql():
+    """Initialize PostgreSQL (WorkOrders)"""
     try:
         from database.postgresql_setup import PostgreSQLSetup
         postgres_setup = PostgreSQLSetup()
@@ -45,36 +43,47 @@ def initialize_databases():
             db_created = postgres_setup.create_database()
             if db_created:
                 schema_created = postgres_setup.create_workorders_schema()
-                results['postgresql'] = {
+                logger.info("PostgreSQL initialized successfully")
+                return {
                     'status': 'success' if schema_created else 'schema_failed', 
                     'message': postgres_message
                 }
-                logger.info("PostgreSQL initialized successfully")
-            else:
-                results['postgresql'] = {'status': 'db_creation_failed', 'message': postgres_message}
-                logger.warning(f"PostgreSQL database creation failed: {postgres_message}")
-        else:
-            results['postgresql'] = {'status': 'failed', 'message': postgres_message}
-            logger.warning(f"PostgreSQL initialization failed: {postgres_message}")
+            logger.warning(f"PostgreSQL database creation failed: {postgres_message}")
+            return {'status': 'db_creation_failed', 'message': postgres_message}
+        logger.warning(f"PostgreSQL initialization failed: {postgres_message}")
+        return {'status': 'failed', 'message': postgres_message}
             
     except Exception as e:
-        results['postgresql'] = {'status': 'error', 'message': str(e)}
         logger.warning(f"PostgreSQL error: {e}")
-    
-    # 3. Create HR Excel data
+        return {'status': 'error', 'message': str(e)}
+
+def init_hr_excel():
+    """Create HR Excel data"""
     try:
-        from data.create_hr_data import create_sample_hr_data
-        excel_created = create_sample_hr_data()
-        results['hr_excel'] = {
+        from data.create_hr_data import create_hr_excel_file
+        excel_created = create_hr_excel_file()
+        logger.info("HR Excel data created successfully")
+        return {
             'status': 'success' if excel_created else 'failed',
             'message': 'HR Excel data created'
         }
-        logger.info("HR Excel data created successfully")
     except Exception as e:
-        results['hr_excel'] = {'status': 'error', 'message': str(e)}
         logger.error(f"HR Excel creation failed: {e}")
+        return {'status': 'error', 'message': str(e)}
+
+def initialize_databases():
+    """Initialize all database systems"""
+    steps = {
+        'sql_server': init_sql_server,
+        'postgresql': init_postgresql,
+        'hr_excel': init_hr_excel
+    }
+    
+    # The systems are independent and I/O bound, so initialize them concurrently
+    with ThreadPoolExecutor(max_workers=len(steps)) as executor:
+        futures = {name: executor.submit(step) for name, step in steps.items()}
     
-    return results
+    return {name: future.result() for name, future in futures.items()}
 
 if __name__ == "__main__":
     print("Initializing MCP Workflow System Databases...")
@@ -5,12 +5,171 @@ import json
 
 logger = logging.getLogger(__name__)
 
+_oracle_client_initialized = False
+
+def init_oracle_client():
+    """Load the Oracle client libraries (thick mode) once per process"""
+    global _oracle_client_initialized
+    if not _oracle_client_initialized:
+        oracledb.init_oracle_client()
+        _oracle_client_initialized = True
+
+# Tables and sequences, created in one round-trip; each object has its own
+# handler so an existing one (ORA-00955) is skipped on its own
+SCHEMA_DDL = """
+    BEGIN
+        -- workorders table
+        BEGIN
+            EXECUTE IMMEDIATE '
+                CREATE TABLE workorders (
+                    workorder_id VARCHAR2(50) PRIMARY KEY,
+                    equipment_id VARCHAR2(50) NOT NULL,
+                    title VARCHAR2(200) NOT NULL,
+                    description VARCHAR2(1000),
+                    status VARCHAR2(20) DEFAULT ''draft'',
+                    priority VARCHAR2(10) DEFAULT ''medium'',
+                    created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    assigned_to VARCHAR2(50),
+                    required_parts CLOB,
+                    permits_required CLOB,
+                    estimated_hours NUMBER,
+                    actual_hours NUMBER,
+                    completed_date TIMESTAMP,
+                    created_by VARCHAR2(50) DEFAULT ''system''
+                )
+            ';
+        EXCEPTION
+            WHEN OTHERS THEN
+                IF SQLCODE != -955 THEN
+                    RAISE;
+                END IF;
+        END;
+
+        -- workorder_audit table
+        BEGIN
+            EXECUTE IMMEDIATE '
+                CREATE TABLE workorder_audit (
+                    audit_id NUMBER PRIMARY KEY,
+                    workorder_id VARCHAR2(50) NOT NULL,
+                    action VARCHAR2(20) NOT NULL,
+                    action_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    performed_by VARCHAR2(50),
+                    details CLOB
+                )
+            ';
+        EXCEPTION
+            WHEN OTHERS THEN
+                IF SQLCODE != -955 THEN
+                    RAISE;
+                END IF;
+        END;
+
+        -- Sequence for audit IDs
+        BEGIN
+            EXECUTE IMMEDIATE 'CREATE SEQUENCE workorder_audit_seq START WITH 1 INCREMENT BY 1 NOCACHE NOCYCLE';
+        EXCEPTION
+            WHEN OTHERS THEN
+                IF SQLCODE != -955 THEN
+                    RAISE;
+                END IF;
+        END;
+
+        -- Sequence for workorder IDs
+        BEGIN
+            EXECUTE IMMEDIATE 'CREATE SEQUENCE workorder_seq START WITH 1000 INCREMENT BY 1 NOCACHE NOCYCLE';
+        EXCEPTION
+            WHEN OTHERS THEN
+                IF SQLCODE != -955 THEN
+                    RAISE;
+                END IF;
+        END;
+    END;
+"""
+
+# Sample work orders
+SAMPLE_WORKORDERS = [
+    ('WO-2024-1001', 'pump-001', 'Routine Pump Maintenance', 
+     'Scheduled maintenance for pump-001 including seal inspection and lubrication',
+     'completed', 'low', 'EMP001', 
+     json.dumps(['pump-seal-001', 'gasket-003']), 
+     json.dumps(['work-permit']), 4.0, 3.5, None),
+
+    ('WO-2024-1002', 'pump-002', 'Emergency Seal Replacement', 
+     'Urgent seal replacement due to leakage in pump-002',
+     'in_progress', 'high', 'EMP002', 
+     json.dumps(['pump-seal-001', 'bearing-002']), 
+     json.dumps(['hot-work-permit', 'safety-permit']), 8.0, 2.0, None),
+
+    ('WO-2024-1003', 'valve-001', 'Control Valve Calibration',
+     'Quarterly calibration of control valve-001 for pressure regulation',
+     'pending_approval', 'medium', None,
+     json.dumps(['valve-004']),
+     json.dumps(['work-permit']), 2.0, None, None)
+]
+
+# One insert-only MERGE for all rows: the source is a UNION ALL of one dual
+# select per sample workorder, with its own named binds. Existing workorders
+# are left as they are. Built once at import.
+_WORKORDER_COLUMNS = (
+    "workorder_id", "equipment_id", "title", "description", "status", "priority",
+    "assigned_to", "required_parts", "permits_required", "estimated_hours",
+    "actual_hours", "completed_date"
+)
+_SEED_USING_CLAUSE = "\n        UNION ALL ".join(
+    "SELECT " + ", ".join(f":{col}_{i} AS {col}" for col in _WORKORDER_COLUMNS) + " FROM dual"
+    for i in range(len(SAMPLE_WORKORDERS))
+)
+SEED_WORKORDERS_SQL = f"""
+    MERGE INTO workorders target
+    USING ({_SEED_USING_CLAUSE}) source
+    ON (target.workorder_id = source.workorder_id)
+    WHEN NOT MATCHED THEN
+        INSERT (workorder_id, equipment_id, title, description, status, 
+               priority, assigned_to, required_parts, permits_required,
+               estimated_hours, actual_hours, completed_date)
+        VALUES (source.workorder_id, source.equipment_id, source.title,
+               source.description, source.status, source.priority,
+               source.assigned_to, source.required_parts, 
+               source.permits_required, source.estimated_hours,
+               source.actual_hours, source.completed_date)
+"""
+SEED_WORKORDERS_PARAMS = {
+    f"{col}_{i}": value
+    for i, wo in enumerate(SAMPLE_WORKORDERS)
+    for col, value in zip(_WORKORDER_COLUMNS, wo)
+}
+# Every bind gets an explicit type so each UNION ALL branch has the same
+# column datatypes even where a value is None (which oracledb would otherwise
+# bind as VARCHAR, failing with ORA-01790 against a NUMBER in another row).
+# The JSON columns are serialized above, once, and bound as plain VARCHAR2
+# strings that Oracle converts into the CLOB columns on insert; CLOB binds
+# would need a temporary LOB per value.
+_WORKORDER_BIND_TYPES = (
+    ("workorder_id", oracledb.DB_TYPE_VARCHAR),
+    ("equipment_id", oracledb.DB_TYPE_VARCHAR),
+    ("title", oracledb.DB_TYPE_VARCHAR),
+    ("description", oracledb.DB_TYPE_VARCHAR),
+    ("status", oracledb.DB_TYPE_VARCHAR),
+    ("priority", oracledb.DB_TYPE_VARCHAR),
+    ("assigned_to", oracledb.DB_TYPE_VARCHAR),
+    ("required_parts", oracledb.DB_TYPE_VARCHAR),
+    ("permits_required", oracledb.DB_TYPE_VARCHAR),
+    ("estimated_hours", oracledb.DB_TYPE_NUMBER),
+    ("actual_hours", oracledb.DB_TYPE_NUMBER),
+    ("completed_date", oracledb.DB_TYPE_TIMESTAMP),
+)
+SEED_WORKORDERS_INPUT_SIZES = {
+    f"{col}_{i}": db_type
+    for i in range(len(SAMPLE_WORKORDERS))
+    for col, db_type in _WORKORDER_BIND_TYPES
+}
+
 class OracleSetup:
     def __init__(self):
         self.connection_config = ORACLE_CONNECTION_STRING_ORACLEDB
         
         # Configure oracledb to use thick mode for advanced features
-        oracledb.init_oracle_client()
+        init_oracle_client()
     
     def test_connection(self):
         """Test connection to Oracle Cloud Database"""
@@ -30,131 +189,16 @@ class OracleSetup:
         """Create workorders database schema"""
         try:
             connection = oracledb.connect(**self.connection_config)
+            # All seed DML commits once at the end
+            connection.autocommit = False
             cursor = connection.cursor()
             
-            # Create workorders table
-            cursor.execute("""
-                BEGIN
-                    EXECUTE IMMEDIATE '
-                        CREATE TABLE workorders (
-                            workorder_id VARCHAR2(50) PRIMARY KEY,
-                            equipment_id VARCHAR2(50) NOT NULL,
-                            title VARCHAR2(200) NOT NULL,
-                            description VARCHAR2(1000),
-                            status VARCHAR2(20) DEFAULT ''draft'',
-                            priority VARCHAR2(10) DEFAULT ''medium'',
-                            created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                            assigned_to VARCHAR2(50),
-                            required_parts CLOB,
-                            permits_required CLOB,
-                            estimated_hours NUMBER,
-                            actual_hours NUMBER,
-                            completed_date TIMESTAMP,
-                            created_by VARCHAR2(50) DEFAULT ''system''
-                        )
-                    ';
-                EXCEPTION
-                    WHEN OTHERS THEN
-                        IF SQLCODE != -955 THEN
-                            RAISE;
-                        END IF;
-                END;
-            """)
-            
-            # Create workorder_audit table
-            cursor.execute("""
-                BEGIN
-                    EXECUTE IMMEDIATE '
-                        CREATE TABLE workorder_audit (
-                            audit_id NUMBER PRIMARY KEY,
-                            workorder_id VARCHAR2(50) NOT NULL,
-                            action VARCHAR2(20) NOT NULL,
-                            action_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                            performed_by VARCHAR2(50),
-                            details CLOB
-                        )
-                    ';
-                EXCEPTION
-                    WHEN OTHERS THEN
-                        IF SQLCODE != -955 THEN
-                            RAISE;
-                        END IF;
-                END;
-            """)
-            
-            # Create sequence for audit IDs
-            cursor.execute("""
-                BEGIN
-                    EXECUTE IMMEDIATE 'CREATE SEQUENCE workorder_audit_seq START WITH 1 INCREMENT BY 1 NOCACHE NOCYCLE';
-                EXCEPTION
-                    WHEN OTHERS THEN
-                        IF SQLCODE != -955 THEN
-                            RAISE;
-                        END IF;
-                END;
-            """)
-            
-            # Create sequence for workorder IDs
-            cursor.execute("""
-                BEGIN
-                    EXECUTE IMMEDIATE 'CREATE SEQUENCE workorder_seq START WITH 1000 INCREMENT BY 1 NOCACHE NOCYCLE';
-                EXCEPTION
-                    WHEN OTHERS THEN
-                        IF SQLCODE != -955 THEN
-                            RAISE;
-                        END IF;
-                END;
-            """)
-            
-            # Insert sample work orders
-            sample_workorders = [
-                ('WO-2024-1001', 'pump-001', 'Routine Pump Maintenance', 
-                 'Scheduled maintenance for pump-001 including seal inspection and lubrication',
-                 'completed', 'low', 'EMP001', 
-                 json.dumps(['pump-seal-001', 'gasket-003']), 
-                 json.dumps(['work-permit']), 4.0, 3.5, None),
-                
-                ('WO-2024-1002', 'pump-002', 'Emergency Seal Replacement', 
-                 'Urgent seal replacement due to leakage in pump-002',
-                 'in_progress', 'high', 'EMP002', 
-                 json.dumps(['pump-seal-001', 'bearing-002']), 
-                 json.dumps(['hot-work-permit', 'safety-permit']), 8.0, 2.0, None),
-                
-                ('WO-2024-1003', 'valve-001', 'Control Valve Calibration',
-                 'Quarterly calibration of control valve-001 for pressure regulation',
-                 'pending_approval', 'medium', None,
-                 json.dumps(['valve-004']),
-                 json.dumps(['work-permit']), 2.0, None, None)
-            ]
+            # Create the tables and sequences
+            cursor.execute(SCHEMA_DDL)
             
-            for wo in sample_workorders:
-                cursor.execute("""
-                    MERGE INTO workorders target
-                    USING (SELECT :1 as workorder_id, :2 as equipment_id, :3 as title, 
-                                  :4 as description, :5 as status, :6 as priority,
-                                  :7 as assigned_to, :8 as required_parts, 
-                                  :9 as permits_required, :10 as estimated_hours,
-                                  :11 as actual_hours, :12 as completed_date FROM dual) source
-                    ON (target.workorder_id = source.workorder_id)
-                    WHEN MATCHED THEN
-                        UPDATE SET equipment_id = source.equipment_id, title = source.title,
-                                  description = source.description, status = source.status,
-                                  priority = source.priority, assigned_to = source.assigned_to,
-                                  required_parts = source.required_parts, 
-                                  permits_required = source.permits_required,
-                                  estimated_hours = source.estimated_hours,
-                                  actual_hours = source.actual_hours,
-                                  completed_date = source.completed_date
-                    WHEN NOT MATCHED THEN
-                        INSERT (workorder_id, equipment_id, title, description, status, 
-                               priority, assigned_to, required_parts, permits_required,
-                               estimated_hours, actual_hours, completed_date)
-                        VALUES (source.workorder_id, source.equipment_id, source.title,
-                               source.description, source.status, source.priority,
-                               source.assigned_to, source.required_parts, 
-                               source.permits_required, source.estimated_hours,
-                               source.actual_hours, source.completed_date)
-                """, wo)
+            # Insert missing sample work orders in a single statement
+            cursor.setinputsizes(**SEED_WORKORDERS_INPUT_SIZES)
+            cursor.execute(SEED_WORKORDERS_SQL, SEED_WORKORDERS_PARAMS)
             
             connection.commit()
             connection.close()
@@ -15,6 +15,62 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Schema and seed statements, built once at import
+CREATE_DATABASE_SQL = f"""
+    IF NOT EXISTS (SELECT name FROM sys.databases WHERE name = '{DatabaseConfig.SQL_SERVER_DB}')
+    CREATE DATABASE [{DatabaseConfig.SQL_SERVER_DB}]
+"""
+USE_DATABASE_SQL = f"USE [{DatabaseConfig.SQL_SERVER_DB}]"
+
+INVENTORY_TABLE_DDL = """
+    IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='inventory' AND xtype='U')
+    CREATE TABLE inventory (
+        item_id NVARCHAR(50) PRIMARY KEY,
+        name NVARCHAR(100) NOT NULL,
+        description NVARCHAR(500),
+        quantity INT NOT NULL DEFAULT 0,
+        min_stock INT NOT NULL DEFAULT 0,
+        max_stock INT NOT NULL DEFAULT 100,
+        location NVARCHAR(100),
+        last_updated DATETIME DEFAULT GETDATE()
+    )
+"""
+
+INVENTORY_TRANSACTIONS_TABLE_DDL = """
+    IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='inventory_transactions' AND xtype='U')
+    CREATE TABLE inventory_transactions (
+        transaction_id INT IDENTITY(1,1) PRIMARY KEY,
+        item_id NVARCHAR(50) NOT NULL,
+        transaction_type NVARCHAR(20) NOT NULL,
+        quantity INT NOT NULL,
+        workorder_id NVARCHAR(50),
+        transaction_date DATETIME DEFAULT GETDATE(),
+        FOREIGN KEY (item_id) REFERENCES inventory(item_id)
+    )
+"""
+
+# Sample data
+SAMPLE_INVENTORY = [
+    ('pump-seal-001', 'Pump Seal Kit', 'Seal kit for centrifugal pumps', 15, 5, 50, 'Warehouse A'),
+    ('bearing-002', 'Ball Bearing', 'High precision ball bearing', 30, 10, 100, 'Warehouse B'),
+    ('gasket-003', 'Mechanical Gasket', 'High temperature gasket', 25, 8, 80, 'Warehouse A'),
+    ('valve-004', 'Control Valve', 'Pressure control valve', 8, 3, 30, 'Warehouse C'),
+    ('motor-005', 'Electric Motor', '1HP industrial motor', 5, 2, 20, 'Warehouse B'),
+    ('coupling-006', 'Shaft Coupling', 'Flexible shaft coupling', 12, 4, 40, 'Warehouse A'),
+    ('sensor-007', 'Pressure Sensor', 'Digital pressure sensor', 20, 5, 60, 'Warehouse C'),
+    ('filter-008', 'Oil Filter', 'Industrial oil filter', 18, 6, 70, 'Warehouse B')
+]
+
+_SEED_INVENTORY_ROWS = ", ".join(["(?, ?, ?, ?, ?, ?, ?)"] * len(SAMPLE_INVENTORY))
+SEED_INVENTORY_SQL = f"""
+    INSERT INTO inventory (item_id, name, description, quantity, min_stock, max_stock, location)
+    SELECT v.item_id, v.name, v.description, v.quantity, v.min_stock, v.max_stock, v.location
+    FROM (VALUES {_SEED_INVENTORY_ROWS})
+        AS v (item_id, name, description, quantity, min_stock, max_stock, location)
+    WHERE NOT EXISTS (SELECT 1 FROM inventory i WHERE i.item_id = v.item_id)
+"""
+SEED_INVENTORY_PARAMS = [value for item in SAMPLE_INVENTORY for value in item]
+
 class SQLServerSetup:
     def __init__(self):
         # Connection string for direct pyodbc connection
@@ -46,61 +102,17 @@ class SQLServerSetup:
             cursor = conn.cursor()
             
             # Check if database exists, create if not
-            cursor.execute(f"""
-                IF NOT EXISTS (SELECT name FROM sys.databases WHERE name = '{DatabaseConfig.SQL_SERVER_DB}')
-                CREATE DATABASE [{DatabaseConfig.SQL_SERVER_DB}]
-            """)
+            cursor.execute(CREATE_DATABASE_SQL)
             
             # Use the database
-            cursor.execute(f"USE [{DatabaseConfig.SQL_SERVER_DB}]")
-            
-            # Create inventory table
-            cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='inventory' AND xtype='U')
-                CREATE TABLE inventory (
-                    item_id NVARCHAR(50) PRIMARY KEY,
-                    name NVARCHAR(100) NOT NULL,
-                    description NVARCHAR(500),
-                    quantity INT NOT NULL DEFAULT 0,
-                    min_stock INT NOT NULL DEFAULT 0,
-                    max_stock INT NOT NULL DEFAULT 100,
-                    location NVARCHAR(100),
-                    last_updated DATETIME DEFAULT GETDATE()
-                )
-            """)
-            
-            # Create inventory transactions table
-            cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='inventory_transactions' AND xtype='U')
-                CREATE TABLE inventory_transactions (
-                    transaction_id INT IDENTITY(1,1) PRIMARY KEY,
-                    item_id NVARCHAR(50) NOT NULL,
-                    transaction_type NVARCHAR(20) NOT NULL,
-                    quantity INT NOT NULL,
-                    workorder_id NVARCHAR(50),
-                    transaction_date DATETIME DEFAULT GETDATE(),
-                    FOREIGN KEY (item_id) REFERENCES inventory(item_id)
-                )
-            """)
+            cursor.execute(USE_DATABASE_SQL)
             
-            # Insert sample data
-            sample_data = [
-                ('pump-seal-001', 'Pump Seal Kit', 'Seal kit for centrifugal pumps', 15, 5, 50, 'Warehouse A'),
-                ('bearing-002', 'Ball Bearing', 'High precision ball bearing', 30, 10, 100, 'Warehouse B'),
-                ('gasket-003', 'Mechanical Gasket', 'High temperature gasket', 25, 8, 80, 'Warehouse A'),
-                ('valve-004', 'Control Valve', 'Pressure control valve', 8, 3, 30, 'Warehouse C'),
-                ('motor-005', 'Electric Motor', '1HP industrial motor', 5, 2, 20, 'Warehouse B'),
-                ('coupling-006', 'Shaft Coupling', 'Flexible shaft coupling', 12, 4, 40, 'Warehouse A'),
-                ('sensor-007', 'Pressure Sensor', 'Digital pressure sensor', 20, 5, 60, 'Warehouse C'),
-                ('filter-008', 'Oil Filter', 'Industrial oil filter', 18, 6, 70, 'Warehouse B')
-            ]
+            # Create inventory and inventory transactions tables
+            cursor.execute(INVENTORY_TABLE_DDL)
+            cursor.execute(INVENTORY_TRANSACTIONS_TABLE_DDL)
             
-            for item in sample_data:
-                cursor.execute("""
-                    IF NOT EXISTS (SELECT 1 FROM inventory WHERE item_id = ?)
-                    INSERT INTO inventory (item_id, name, description, quantity, min_stock, max_stock, location)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, item[0], *item)
+            # Seed every row in one round-trip; items that already exist are left untouched
+            cursor.execute(SEED_INVENTORY_SQL, SEED_INVENTORY_PARAMS)
             
             conn.commit()
             conn.close()
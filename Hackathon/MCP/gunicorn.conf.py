@@ -0,0 +1,10 @@
+# Gunicorn settings for the MCP workflow agent:
+#   gunicorn agent:app -c gunicorn.conf.py
+bind = "0.0.0.0:8000"
+worker_class = "uvicorn.workers.UvicornWorker"
+# One worker: approvals, the analysis cache and the admission limit live in
+# process memory, so extra workers would split them. Raise this only after
+# that state moves to a shared store.
+workers = 1
+preload_app = True
+keepalive = 5
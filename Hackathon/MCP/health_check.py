@@ -93,7 +93,7 @@ async def health_overview():
     
     return {
         "overall_status": overall_status.value,
-        "systems": {name: status.dict() for name, status in health_status.items()},
+        "systems": {name: status.model_dump() for name, status in health_status.items()},
         "timestamp": time.time()
     }
 
@@ -104,4 +104,4 @@ async def health_system(system_name: str):
         return {"error": f"System {system_name} not found"}
     
     health_status = await checker.check_system_health(system_name, checker.systems[system_name])
-    return health_status.dict()
+    return health_status.model_dump()
@@ -78,7 +78,7 @@ async def system_status():
     
     return {
         "overall_status": overall_status.value,
-        "systems": {name: status.dict() for name, status in health_status.items()},
+        "systems": {name: status.model_dump() for name, status in health_status.items()},
         "timestamp": asyncio.get_event_loop().time()
     }
 
@@ -141,11 +141,12 @@ async def list_systems():
     }
 
 if __name__ == "__main__":
-    # Run the application - use import string for reload
+    # Run the application; loop="auto" picks uvloop where it is installed
     uvicorn.run(
-        "main:app",  # Use import string instead of app object
+        "main:app",
         host="0.0.0.0",
         port=8000,
         log_level="info",
-        reload=True  # This will work now with import string
+        loop="auto",
+        http="httptools"
     )
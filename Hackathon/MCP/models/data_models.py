@@ -88,6 +88,18 @@ class WorkflowResponse(BaseModel):
     approval_code: Optional[str] = Field(None, description="Approval tracking code")
     details: Dict[str, Any] = Field(default_factory=dict)
 
+class ChatMessage(BaseModel):
+    message: str
+    user_id: Optional[str] = "user"
+    session_id: Optional[str] = None
+
+class ChatResponse(BaseModel):
+    response: str
+    requires_approval: bool = False
+    approval_code: Optional[str] = None
+    actions: List[str] = []
+    details: Dict[str, Any] = {}
+
 class SystemHealthStatus(BaseModel):
     system_name: str = Field(..., description="System name")
     status: SystemHealth = Field(..., description="Health status")
@@ -103,3 +115,14 @@ class ApprovalRequest(BaseModel):
     status: ApprovalStatus = Field(default=ApprovalStatus.PENDING)
     approval_items: List[Dict[str, Any]] = Field(default_factory=list)
     comments: Optional[str] = Field(None, description="Approval comments")
+
+class PartRequirement(BaseModel):
+    part_code: str = Field(..., description="Inventory part code")
+    quantity: int = Field(..., description="Quantity needed")
+
+class MaintenanceAnalysis(BaseModel):
+    required_parts: List[PartRequirement] = Field(..., description="Parts and quantities needed")
+    required_skills: List[str] = Field(..., description="Skills needed for the repair")
+    estimated_hours: float = Field(..., description="Estimated time to complete")
+    risk_level: str = Field(..., description="low, medium, high or critical")
+    special_requirements: List[str] = Field(..., description="Special tools or safety requirements")
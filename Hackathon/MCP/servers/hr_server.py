@@ -55,7 +55,7 @@ class HRService:
             }
             self.hr_df = pd.DataFrame(sample_data)
             # Save sample data
-            self.hr_df.to_excel(self.excel_file_path, index=False)
+            self.hr_df.to_excel(self.excel_file_path, index=False, engine='xlsxwriter')
             logger.info("Sample HR data created and saved")
 
     def get_available_employees(self, required_skills: List[str] = None, 
@@ -89,7 +89,7 @@ class HRService:
                     current_workload=row['current_workload'],
                     available=row['available']
                 )
-                employees.append(employee.dict())
+                employees.append(employee.model_dump())
             
             return {
                 "available_employees": employees,
@@ -113,7 +113,7 @@ class HRService:
                 self.hr_df.at[idx, 'current_workload'] += 1
                 
                 # Save updated data
-                self.hr_df.to_excel(self.excel_file_path, index=False)
+                self.hr_df.to_excel(self.excel_file_path, index=False, engine='xlsxwriter')
                 
                 return {
                     "success": True,
@@ -145,7 +145,7 @@ class HRService:
                     self.hr_df.at[idx, 'current_workload'] -= 1
                 
                 # Save updated data
-                self.hr_df.to_excel(self.excel_file_path, index=False)
+                self.hr_df.to_excel(self.excel_file_path, index=False, engine='xlsxwriter')
                 
                 return {
                     "success": True,
@@ -182,7 +182,7 @@ class HRService:
                 )
                 
                 return {
-                    "employee": employee.dict(),
+                    "employee": employee.model_dump(),
                     "success": True
                 }
             else:
@@ -210,7 +210,7 @@ class HRService:
                     current_workload=row['current_workload'],
                     available=row['available']
                 )
-                employees.append(employee.dict())
+                employees.append(employee.model_dump())
             
             return {
                 "employees": employees,
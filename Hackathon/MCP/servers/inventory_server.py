@@ -1,9 +1,9 @@
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from sqlalchemy import create_engine, text
 from sqlalchemy.exc import SQLAlchemyError
-from config.settings import SQL_SERVER_CONNECTION_STRING
+from config.settings import SQL_SERVER_CONNECTION_STRING, SQL_ENGINE_POOL_OPTIONS
 from models.data_models import InventoryItem, SystemHealthStatus, SystemHealth
 import time
 
@@ -17,8 +17,9 @@ class MCPResponse(BaseModel):
     result: Dict[str, Any]
     error: Optional[str] = None
 
-# Database connection
-engine = create_engine(SQL_SERVER_CONNECTION_STRING)
+# Database connection; fast_executemany sends multi-row parameter sets in one
+# round-trip instead of one prepared execution per row
+engine = create_engine(SQL_SERVER_CONNECTION_STRING, fast_executemany=True, **SQL_ENGINE_POOL_OPTIONS)
 
 @app.get("/health")
 async def health_check():
@@ -96,7 +97,8 @@ async def reserve_items(request: MCPRequest):
             raise HTTPException(status_code=400, detail="No items to reserve")
         
         reserved_items = {}
-        with engine.connect() as conn:
+        # One transaction for every reservation, committed when the block exits
+        with engine.begin() as conn:
             for item_id, quantity in item_quantities.items():
                 # Check current stock
                 result = conn.execute(
@@ -128,8 +130,6 @@ async def reserve_items(request: MCPRequest):
                         "success": False,
                         "message": f"Insufficient stock. Available: {current_stock}, Required: {quantity}"
                     }
-            
-            conn.commit()
         
         all_reserved = all(item["success"] for item in reserved_items.values())
         
@@ -87,7 +87,7 @@ class PermitsMCPServer:
         return {
             "success": True,
             "permit_id": permit_id,
-            "permit": permit.dict(),
+            "permit": permit.model_dump(),
             "message": f"Permit request created for {permit_type}"
         }
 
@@ -1,12 +1,26 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 import psycopg2
-from config.settings import DatabaseConfig
+from config.settings import DatabaseConfig, MCP_SERVER_URLS
+import asyncio
+import httpx
 import time
 import logging
 
-app = FastAPI(title="WorkOrders MCP Server")
+# Peer MCP servers queried by the workflow bootstrap endpoint
+INVENTORY_URL = MCP_SERVER_URLS["inventory"]
+HR_URL = MCP_SERVER_URLS["hr"]
+peer_client = httpx.AsyncClient(timeout=httpx.Timeout(5.0, connect=1.0))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await peer_client.aclose()
+
+app = FastAPI(title="WorkOrders MCP Server", lifespan=lifespan)
 
 class MCPRequest(BaseModel):
     method: str
@@ -113,6 +127,11 @@ async def list_workorders(request: MCPRequest):
 @app.post("/mcp/workorders/create")
 async def create_workorder(request: MCPRequest):
     """Create a new workorder in PostgreSQL database"""
+    # psycopg2 blocks, so the insert runs in the threadpool and leaves the
+    # event loop free for concurrent work (e.g. the bootstrap peer calls)
+    return await run_in_threadpool(_insert_workorder, request)
+
+def _insert_workorder(request: MCPRequest) -> MCPResponse:
     try:
         equipment_id = request.params.get("equipment_id")
         description = request.params.get("description")
@@ -385,6 +404,65 @@ async def get_workorder_statistics(request: MCPRequest):
         logger.error(f"Error fetching workorder statistics: {str(e)}")
         return MCPResponse(result={}, error=str(e))
 
+async def call_peer(url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """POST an MCP request to a peer server, returning an error dict on failure"""
+    try:
+        response = await peer_client.post(url, json=payload)
+        response.raise_for_status()
+        return response.json()
+    except Exception as e:
+        logger.error("Error calling %s: %s", url, e)
+        return {"error": str(e)}
+
+@app.post("/mcp/workflow/bootstrap")
+async def bootstrap_workflow(request: MCPRequest):
+    """Create a workorder and collect inventory and HR availability in one MCP call"""
+    equipment_id = request.params.get("equipment_id")
+    required_parts = request.params.get("required_parts", {})
+    required_skills = request.params.get("required_skills", [])
+    
+    inventory_result, hr_result, workorder_result = await asyncio.gather(
+        call_peer(f"{INVENTORY_URL}/mcp/inventory/check", {
+            "method": "check",
+            "params": {
+                "item_codes": list(required_parts),
+                "quantities": required_parts
+            }
+        }),
+        call_peer(f"{HR_URL}/mcp/hr/available_employees", {
+            "method": "available_employees",
+            "params": {
+                "required_skills": required_skills,
+                "max_workload": 2
+            }
+        }),
+        create_workorder(MCPRequest(method="create", params={
+            "equipment_id": equipment_id,
+            "description": request.params.get("description"),
+            "priority": request.params.get("priority", "medium"),
+            "estimated_hours": request.params.get("estimated_hours")
+        })),
+    )
+    
+    # Peer failures are reported rather than passed off as empty results
+    errors = {
+        name: error for name, error in (
+            ("workorders", workorder_result.error),
+            ("inventory", inventory_result.get("error")),
+            ("hr", hr_result.get("error")),
+        ) if error
+    }
+    
+    return MCPResponse(
+        result={
+            "workorder_id": workorder_result.result.get("workorder_id"),
+            "inventory_status": inventory_result.get("result") or {},
+            "available_employees": (hr_result.get("result") or {}).get("available_employees", []),
+            "errors": errors
+        },
+        error="; ".join(f"{name}: {error}" for name, error in errors.items()) or None
+    )
+
 if __name__ == "__main__":
     import uvicorn
     print("Starting WorkOrders MCP Server on http://localhost:8003")